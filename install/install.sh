@@ -282,7 +282,7 @@ echo "   sudo passwd usb-kiosk"
 echo ""
 echo "2. Update admin dashboard credentials:"
 echo "   sudo nano /etc/usb-defender/app_config.yaml"
-echo "   (Edit the 'admin_password' field)"
+echo "   (Edit dashboard 'password'; hash it with: python3 -m src.dashboard.auth <password>)"
 echo ""
 echo "3. Review and customize configuration:"
 echo "   sudo nano /etc/usb-defender/app_config.yaml"
@@ -68,7 +68,7 @@ PACKAGES=(
     "libreoffice-writer"
     "libreoffice-calc"
     "libreoffice-impress"
-    "imagemagick"
+    "poppler-utils"
     "udev"
     "udisks2"
     "libmagic1"
@@ -5,15 +5,43 @@ Coordinates the conversion of multiple files
 
 from pathlib import Path
 from typing import List, Dict, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import json
+import logging
+import multiprocessing
+import os
+import tempfile
 from datetime import datetime
 from src.converter.document_to_image import DocumentConverter
 from src.utils.logger import KioskLogger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 logger = KioskLogger.get_logger(__name__)
 
 
+def _convert_one(file_path: Path, output_dir: Path, config: dict) -> List[Path]:
+    """
+    Convert a single file in a worker process
+    
+    A fresh DocumentConverter is built in the worker so nothing unpicklable
+    has to cross the process boundary.
+    
+    Args:
+        file_path: Path to input file
+        output_dir: Directory to save output images
+        config: Conversion configuration
+        
+    Returns:
+        List of paths to generated images
+    """
+    return DocumentConverter(config).convert_file(file_path, output_dir)
+
+
 class ConversionResult:
     """Result of file conversion"""
     
@@ -34,6 +62,67 @@ class ConversionResult:
         return f"ConversionResult({self.source_path.name}, {status}, {len(self.output_paths)} files)"
 
 
+class ResultsTable:
+    """
+    Columnar store of conversion results
+    
+    Keeps each field in its own list so summaries and manifests are a pass
+    over one contiguous column instead of attribute lookups across objects.
+    Supports read-only dict-style access keyed by source path string,
+    returning ConversionResult views.
+    """
+    
+    def __init__(self):
+        """Initialize an empty results table"""
+        self.sources: List[Path] = []
+        self.outputs: List[List[Path]] = []
+        self.success: List[bool] = []
+        self.errors: List[str] = []
+        self._index: Dict[str, int] = {}
+    
+    def add(self, result: ConversionResult):
+        """
+        Append a conversion result
+        
+        Args:
+            result: Result to store
+        """
+        self._index[str(result.source_path)] = len(self.sources)
+        self.sources.append(result.source_path)
+        self.outputs.append(result.output_paths)
+        self.success.append(result.success)
+        self.errors.append(result.error_message)
+    
+    def _row(self, row: int) -> ConversionResult:
+        """Build a ConversionResult view of a row"""
+        result = ConversionResult(self.sources[row])
+        result.output_paths = self.outputs[row]
+        result.success = self.success[row]
+        result.error_message = self.errors[row]
+        return result
+    
+    def __getitem__(self, key: str) -> ConversionResult:
+        return self._row(self._index[key])
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+    
+    def __len__(self) -> int:
+        return len(self.sources)
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def keys(self):
+        return self._index.keys()
+    
+    def values(self) -> List[ConversionResult]:
+        return [self._row(row) for row in range(len(self.sources))]
+    
+    def items(self) -> List[tuple]:
+        return [(key, self._row(row)) for key, row in self._index.items()]
+
+
 class ConverterManager:
     """Manages conversion of multiple files"""
     
@@ -55,7 +144,7 @@ class ConverterManager:
         
         logger.info(f"Converter manager initialized, output dir: {output_base_dir}")
     
-    def convert_files(self, file_paths: List[Path], session_id: str) -> Dict[str, ConversionResult]:
+    def convert_files(self, file_paths: List[Path], session_id: str) -> ResultsTable:
         """
         Convert multiple files
         
@@ -64,7 +153,7 @@ class ConverterManager:
             session_id: Session identifier for organizing output
             
         Returns:
-            Dictionary mapping source paths to ConversionResult objects
+            ResultsTable keyed by source path
         """
         logger.info(f"Converting {len(file_paths)} files for session {session_id}")
         
@@ -72,71 +161,186 @@ class ConverterManager:
         session_dir = self.output_base_dir / session_id
         session_dir.mkdir(parents=True, exist_ok=True)
         
-        results = {}
+        completed: Dict[Path, ConversionResult] = {}
         total_files = len(file_paths)
         
-        for idx, file_path in enumerate(file_paths, 1):
-            # Update progress
-            if self.progress_callback:
-                self.progress_callback(idx, total_files, file_path.name)
-            
-            logger.info(f"Converting file {idx}/{total_files}: {file_path.name}")
-            
-            result = ConversionResult(file_path)
-            
+        # Create each file's output subdirectory up front; session_dir is
+        # known to exist so the cheaper raw os.mkdir is enough. A file whose
+        # directory cannot be created fails on its own, not the whole batch
+        pending = []
+        for file_path in file_paths:
             try:
-                # Create subdirectory for this file's output
-                file_output_dir = session_dir / file_path.stem
-                file_output_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Convert file
-                output_paths = self.converter.convert_file(file_path, file_output_dir)
-                
-                if output_paths:
-                    result.output_paths = output_paths
-                    result.success = True
-                    logger.info(f"Successfully converted {file_path.name} to {len(output_paths)} image(s)")
+                os.mkdir(session_dir / file_path.stem)
+            except FileExistsError:
+                pass
+            except OSError as e:
+                completed[file_path] = self._record_error(file_path, e)
+                continue
+            pending.append(file_path)
+        
+        with tempfile.TemporaryDirectory() as pdf_dir:
+            # Convert office documents to PDF up front with a single LibreOffice run;
+            # anything not covered falls back to per-file conversion
+            sources = {}
+            if self.config.get('batch_office', True):
+                sources = self.converter.bulk_convert_office(pending, Path(pdf_dir))
+            
+            if self.config.get('parallel', True) and len(pending) > 1:
+                completed.update(self._convert_parallel(pending, session_dir, sources))
+            else:
+                for idx, file_path in enumerate(pending, 1):
+                    # Update progress
+                    if self.progress_callback:
+                        self.progress_callback(idx, len(pending), file_path.name)
                     
-                    # Audit log
-                    for output_path in output_paths:
-                        KioskLogger.audit_file_conversion(
-                            str(file_path),
-                            str(output_path),
-                            "SUCCESS"
-                        )
-                else:
-                    result.error_message = "Conversion produced no output"
-                    logger.error(f"Conversion failed for {file_path.name}: no output")
+                    logger.info(f"Converting file {idx}/{len(pending)}: {file_path.name}")
                     
-                    KioskLogger.audit_file_conversion(
-                        str(file_path),
-                        "",
-                        "FAILED: No output"
-                    )
-            
-            except Exception as e:
-                result.error_message = str(e)
-                logger.error(f"Error converting {file_path.name}: {e}", exc_info=True)
-                
-                KioskLogger.audit_file_conversion(
-                    str(file_path),
-                    "",
-                    f"FAILED: {str(e)}"
-                )
-            
-            results[str(file_path)] = result
+                    try:
+                        file_output_dir = session_dir / file_path.stem
+                        
+                        # Convert file
+                        source = sources.get(file_path, file_path)
+                        output_paths = self.converter.convert_file(source, file_output_dir)
+                        completed[file_path] = self._record_result(file_path, output_paths)
+                    
+                    except Exception as e:
+                        completed[file_path] = self._record_error(file_path, e)
+        
+        # Keep results in input order regardless of completion order
+        results = ResultsTable()
+        for file_path in file_paths:
+            results.add(completed[file_path])
         
         # Generate manifest if configured
         if self.config.get('create_manifest', True):
             self._create_manifest(results, session_dir)
         
         # Summary
-        successful = sum(1 for r in results.values() if r.success)
+        successful = sum(results.success)
         logger.info(f"Conversion complete: {successful}/{total_files} successful")
         
         return results
     
-    def _create_manifest(self, results: Dict[str, ConversionResult], session_dir: Path):
+    def _convert_parallel(self, file_paths: List[Path], session_dir: Path,
+                          sources: Dict[Path, Path]) -> Dict[Path, ConversionResult]:
+        """
+        Convert files concurrently in a process pool
+        
+        Each file is converted in a worker process with its own DocumentConverter,
+        so LibreOffice runs and page rendering of different files overlap.
+        
+        Args:
+            file_paths: List of file paths to convert
+            session_dir: Session output directory
+            sources: Pre-converted PDFs to use in place of their source documents
+            
+        Returns:
+            Results keyed by source path
+        """
+        completed = {}
+        total_files = len(file_paths)
+        max_workers = min(self.config.get('max_workers') or os.cpu_count() or 1, total_files)
+        
+        logger.info(f"Converting {total_files} files in parallel with {max_workers} workers")
+        
+        # Never fork the multi-threaded Qt process: workers come from a
+        # single-threaded fork server instead
+        context = multiprocessing.get_context('forkserver')
+        
+        # Workers forward their log records here so they reach the kiosk's logs
+        log_queue = context.Queue()
+        listener = KioskLogger.start_listener(log_queue)
+        
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=context,
+                initializer=KioskLogger.configure_worker,
+                initargs=(log_queue, logging.getLogger().getEffectiveLevel())
+            ) as executor:
+                futures = {}
+                for file_path in file_paths:
+                    file_output_dir = session_dir / file_path.stem
+                    source = sources.get(file_path, file_path)
+                    future = executor.submit(_convert_one, source, file_output_dir, self.config)
+                    futures[future] = file_path
+                
+                for idx, future in enumerate(as_completed(futures), 1):
+                    file_path = futures[future]
+                
+                    # Update progress
+                    if self.progress_callback:
+                        self.progress_callback(idx, total_files, file_path.name)
+                
+                    try:
+                        completed[file_path] = self._record_result(file_path, future.result())
+                    except Exception as e:
+                        completed[file_path] = self._record_error(file_path, e)
+        finally:
+            listener.stop()
+        
+        return completed
+    
+    def _record_result(self, file_path: Path, output_paths: List[Path]) -> ConversionResult:
+        """
+        Build and audit the result of a finished conversion
+        
+        Args:
+            file_path: Source file path
+            output_paths: Images generated by the converter
+            
+        Returns:
+            ConversionResult for the file
+        """
+        result = ConversionResult(file_path)
+        
+        if output_paths:
+            result.output_paths = output_paths
+            result.success = True
+            logger.info(f"Successfully converted {file_path.name} to {len(output_paths)} image(s)")
+            
+            # Audit log, one entry per source file
+            KioskLogger.audit_file_conversion(
+                str(file_path),
+                [str(p) for p in output_paths],
+                "SUCCESS"
+            )
+        else:
+            result.error_message = "Conversion produced no output"
+            logger.error(f"Conversion failed for {file_path.name}: no output")
+            
+            KioskLogger.audit_file_conversion(
+                str(file_path),
+                "",
+                "FAILED: No output"
+            )
+        
+        return result
+    
+    def _record_error(self, file_path: Path, error: Exception) -> ConversionResult:
+        """
+        Build and audit the result of a conversion that raised
+        
+        Args:
+            file_path: Source file path
+            error: Exception raised during conversion
+            
+        Returns:
+            ConversionResult for the file
+        """
+        result = ConversionResult(file_path)
+        result.error_message = str(error)
+        logger.error(f"Error converting {file_path.name}: {error}", exc_info=error)
+        
+        KioskLogger.audit_file_conversion(
+            str(file_path),
+            "",
+            f"FAILED: {str(error)}"
+        )
+        
+        return result
+    
+    def _create_manifest(self, results: ResultsTable, session_dir: Path):
         """
         Create manifest file documenting conversions
         
@@ -145,35 +349,47 @@ class ConverterManager:
             session_dir: Session output directory
         """
         try:
+            successful = sum(results.success)
+            
             manifest = {
                 'session_id': session_dir.name,
                 'timestamp': datetime.now().isoformat(),
                 'total_files': len(results),
-                'successful': sum(1 for r in results.values() if r.success),
-                'failed': sum(1 for r in results.values() if not r.success),
+                'successful': successful,
+                'failed': len(results) - successful,
                 'conversions': []
             }
             
-            for source_path_str, result in results.items():
-                source_path = Path(source_path_str)
+            for source_path, outputs, success, error in zip(
+                results.sources, results.outputs, results.success, results.errors
+            ):
+                # Walk the outputs once for both names and full paths
+                output_files = []
+                output_paths = []
+                for p in outputs:
+                    output_files.append(p.name)
+                    output_paths.append(str(p))
                 
                 conversion_entry = {
                     'source_file': source_path.name,
                     'source_path': str(source_path),
-                    'success': result.success,
-                    'output_files': [p.name for p in result.output_paths],
-                    'output_paths': [str(p) for p in result.output_paths],
+                    'success': success,
+                    'output_files': output_files,
+                    'output_paths': output_paths,
                 }
                 
-                if not result.success:
-                    conversion_entry['error'] = result.error_message
+                if not success:
+                    conversion_entry['error'] = error
                 
                 manifest['conversions'].append(conversion_entry)
             
-            # Write manifest
+            # Write manifest, serialized in memory and written once rather
+            # than streamed as many small writes through json.dump
             manifest_path = session_dir / 'manifest.json'
-            with open(manifest_path, 'w') as f:
-                json.dump(manifest, f, indent=2)
+            if orjson is not None:
+                manifest_path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+            else:
+                manifest_path.write_text(json.dumps(manifest, indent=2))
             
             logger.info(f"Manifest created: {manifest_path}")
         
@@ -189,7 +405,7 @@ class ConverterManager:
         """
         self.progress_callback = callback
     
-    def get_conversion_summary(self, results: Dict[str, ConversionResult]) -> dict:
+    def get_conversion_summary(self, results: ResultsTable) -> dict:
         """
         Get summary of conversion results
         
@@ -200,18 +416,19 @@ class ConverterManager:
             Summary dictionary
         """
         total = len(results)
-        successful = sum(1 for r in results.values() if r.success)
+        successful = sum(results.success)
         failed = total - successful
         
-        total_images = sum(len(r.output_paths) for r in results.values() if r.success)
+        # Failed conversions never carry output paths
+        total_images = sum(map(len, results.outputs))
         
         failed_files = [
             {
-                'filename': Path(path).name,
-                'error': result.error_message
+                'filename': source_path.name,
+                'error': error
             }
-            for path, result in results.items()
-            if not result.success
+            for source_path, success, error in zip(results.sources, results.success, results.errors)
+            if not success
         ]
         
         return {
@@ -221,4 +438,3 @@ class ConverterManager:
             'total_images_generated': total_images,
             'failed_files': failed_files
         }
-
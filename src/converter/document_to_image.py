@@ -3,12 +3,15 @@ USB Defender Kiosk - Document to Image Converter
 Converts documents to images to sanitize content
 """
 
+import functools
+import math
+import re
 import subprocess
 import tempfile
 import shutil
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image
+from typing import List, Dict, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
 import os
 from src.utils.logger import KioskLogger
 
@@ -17,6 +20,120 @@ logger = KioskLogger.get_logger(__name__)
 conversion_logger = KioskLogger.get_logger('conversion')
 
 
+@functools.lru_cache(maxsize=None)
+def _probe(tool: str, flag: str = '--version') -> Tuple[bool, str]:
+    """
+    Check whether an external tool is runnable, once per process
+    
+    Args:
+        tool: Executable name
+        flag: Option that makes the tool print its version
+        
+    Returns:
+        Tuple of (available, version string or error)
+    """
+    try:
+        result = subprocess.run([tool, flag], capture_output=True, timeout=5)
+    except Exception as e:
+        return False, str(e)
+    
+    if result.returncode != 0:
+        return False, f"exit code {result.returncode}"
+    
+    # Poppler tools print their version on stderr
+    return True, (result.stdout or result.stderr).decode(errors='replace').strip()
+
+
+def _stderr_tail(stderr: bytes, limit: int = 4096) -> str:
+    """
+    Decode the end of a subprocess's stderr for logging
+    
+    Args:
+        stderr: Captured stderr
+        limit: Maximum number of trailing bytes to keep
+        
+    Returns:
+        Decoded stderr tail
+    """
+    return stderr[-limit:].decode(errors='replace').strip()
+
+
+def _run_quiet(cmd: List[str], timeout: int, limit: int = 4096) -> Tuple[int, str]:
+    """
+    Run a command with stdout discarded and stderr spooled to a temp file
+    
+    Spooling keeps memory bounded however much the command writes, and only
+    the tail of stderr is read back, when the command fails.
+    
+    Args:
+        cmd: Command argument list
+        timeout: Timeout in seconds
+        limit: Maximum number of trailing stderr bytes to return
+        
+    Returns:
+        Tuple of (return code, stderr tail if the command failed)
+    """
+    with tempfile.TemporaryFile() as stderr:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=stderr, timeout=timeout)
+        if result.returncode == 0:
+            return 0, ""
+        
+        size = stderr.seek(0, os.SEEK_END)
+        stderr.seek(max(0, size - limit))
+        return result.returncode, _stderr_tail(stderr.read(), limit)
+
+
+_PAGE_SIZE_RE = re.compile(r'^Page\s+\d+\s+size:\s+([\d.]+)\s+x\s+([\d.]+)\s+pts', re.MULTILINE)
+
+
+def _pdf_page_sizes(pdf_path: Path) -> List[Tuple[float, float]]:
+    """
+    Get every page's size from pdfinfo
+    
+    Args:
+        pdf_path: PDF file
+        
+    Returns:
+        (width, height) in points for each page, in page order
+        
+    Raises:
+        RuntimeError: If pdfinfo fails
+    """
+    # pdfinfo clamps the last page to the document's page count
+    result = subprocess.run(
+        ['pdfinfo', '-f', '1', '-l', '1000000', str(pdf_path)],
+        capture_output=True,
+        timeout=30
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"pdfinfo failed: {_stderr_tail(result.stderr)}")
+    
+    return [
+        (float(width), float(height))
+        for width, height in _PAGE_SIZE_RE.findall(result.stdout.decode(errors='replace'))
+    ]
+
+
+@functools.lru_cache(maxsize=16)
+def _load_font(path: str, size: int):
+    """
+    Load a TrueType font, falling back to the default font
+    
+    Cached so the font file is only opened and parsed once per process.
+    
+    Args:
+        path: Font file path
+        size: Font size in points
+        
+    Returns:
+        Font object
+    """
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
 class DocumentConverter:
     """Converts documents to images for sanitization"""
     
@@ -49,6 +166,19 @@ class DocumentConverter:
         self.png_compression = config.get('png_compression', 6)
         self.dpi = config.get('dpi', 150)
         self.max_dimension = config.get('max_dimension', 2400)
+        self.optimize_output = config.get('optimize_output', False)
+        
+        # Bilinear is several times cheaper than Lanczos and adequate for sanitized output
+        if config.get('fast_resize', False):
+            self.resample = Image.Resampling.BILINEAR
+        else:
+            self.resample = Image.Resampling.LANCZOS
+        
+        # Map each supported extension to its conversion method once
+        self._dispatch = {ext: self._convert_office_document for ext in self.OFFICE_EXTENSIONS}
+        self._dispatch.update({ext: self._convert_image for ext in self.IMAGE_EXTENSIONS})
+        self._dispatch[self.PDF_EXTENSION] = self._convert_pdf
+        self._dispatch['txt'] = self._convert_text
         
         # Check if required tools are available
         self._check_dependencies()
@@ -56,32 +186,18 @@ class DocumentConverter:
     def _check_dependencies(self):
         """Check if required conversion tools are available"""
         # Check for LibreOffice
-        try:
-            result = subprocess.run(
-                ['soffice', '--version'],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                logger.info(f"LibreOffice available: {result.stdout.decode().strip()}")
-            else:
-                logger.warning("LibreOffice not found - office documents cannot be converted")
-        except Exception as e:
-            logger.warning(f"LibreOffice not available: {e}")
+        available, detail = _probe('soffice')
+        if available:
+            logger.info(f"LibreOffice available: {detail}")
+        else:
+            logger.warning(f"LibreOffice not available - office documents cannot be converted: {detail}")
         
-        # Check for ImageMagick (for PDF conversion)
-        try:
-            result = subprocess.run(
-                ['convert', '-version'],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                logger.info("ImageMagick available")
-            else:
-                logger.warning("ImageMagick not found - PDF conversion may not work")
-        except Exception as e:
-            logger.warning(f"ImageMagick not available: {e}")
+        # Check for poppler
+        available, detail = _probe('pdftoppm', '-v')
+        if available:
+            logger.info(f"pdftoppm available: {detail}")
+        else:
+            logger.warning(f"pdftoppm not available - PDFs cannot be converted: {detail}")
     
     def convert_file(self, input_path: Path, output_dir: Path) -> List[Path]:
         """
@@ -98,25 +214,18 @@ class DocumentConverter:
             conversion_logger.error(f"Input file not found: {input_path}")
             return []
         
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
         extension = input_path.suffix.lower().lstrip('.')
         base_name = input_path.stem
         
         conversion_logger.info(f"Converting {input_path.name} (type: {extension})")
         
         try:
-            if extension in self.OFFICE_EXTENSIONS:
-                return self._convert_office_document(input_path, output_dir, base_name)
-            elif extension == self.PDF_EXTENSION:
-                return self._convert_pdf(input_path, output_dir, base_name)
-            elif extension in self.IMAGE_EXTENSIONS:
-                return self._convert_image(input_path, output_dir, base_name)
-            elif extension == 'txt':
-                return self._convert_text(input_path, output_dir, base_name)
-            else:
+            handler = self._dispatch.get(extension)
+            if handler is None:
                 conversion_logger.warning(f"Unsupported file type: {extension}")
                 return []
+            
+            return handler(input_path, output_dir, base_name)
         
         except Exception as e:
             conversion_logger.error(f"Error converting {input_path.name}: {e}", exc_info=True)
@@ -140,32 +249,109 @@ class DocumentConverter:
             # Step 1: Convert to PDF using LibreOffice headless
             conversion_logger.info(f"Converting {input_path.name} to PDF")
             
-            result = subprocess.run([
-                'soffice',
-                '--headless',
-                '--convert-to', 'pdf',
-                '--outdir', str(temp_path),
-                str(input_path)
-            ], capture_output=True, timeout=120)
+            returncode, stderr = self._run_soffice(temp_path, [input_path], timeout=120)
             
-            if result.returncode != 0:
-                conversion_logger.error(f"LibreOffice conversion failed: {result.stderr.decode()}")
+            if returncode != 0:
+                conversion_logger.error(f"LibreOffice conversion failed: {stderr}")
                 return []
             
-            # Find generated PDF
-            pdf_files = list(temp_path.glob('*.pdf'))
-            if not pdf_files:
+            # LibreOffice names the PDF after the input's stem
+            pdf_path = temp_path / f"{input_path.stem}.pdf"
+            if not pdf_path.exists():
                 conversion_logger.error("No PDF generated by LibreOffice")
                 return []
             
-            pdf_path = pdf_files[0]
-            
             # Step 2: Convert PDF to images
             return self._convert_pdf(pdf_path, output_dir, base_name)
     
+    def bulk_convert_office(self, input_paths: List[Path], temp_dir: Path) -> Dict[Path, Path]:
+        """
+        Convert several office documents to PDF with a single LibreOffice run
+        
+        LibreOffice startup dominates per-document latency, so batching the
+        inputs into one invocation amortizes it across the whole set. Documents
+        sharing a stem would overwrite each other's PDF and are left out; the
+        caller converts anything missing from the result individually.
+        
+        Args:
+            input_paths: Office document paths
+            temp_dir: Directory to write the intermediate PDFs to
+            
+        Returns:
+            Dictionary mapping source paths to generated PDF paths
+        """
+        batch = {}
+        for input_path in input_paths:
+            if input_path.suffix.lower().lstrip('.') in self.OFFICE_EXTENSIONS:
+                batch.setdefault(input_path.stem, input_path)
+        
+        if len(batch) < 2:
+            return {}
+        
+        conversion_logger.info(f"Converting {len(batch)} office documents to PDF in one batch")
+        
+        try:
+            returncode, stderr = self._run_soffice(
+                temp_dir, list(batch.values()), timeout=120 + 30 * len(batch)
+            )
+        except subprocess.TimeoutExpired:
+            conversion_logger.error("Batch LibreOffice conversion timed out")
+            return {}
+        except Exception as e:
+            conversion_logger.error(f"Batch LibreOffice conversion failed: {e}")
+            return {}
+        
+        if returncode != 0:
+            conversion_logger.error(f"Batch LibreOffice conversion failed: {stderr}")
+            return {}
+        
+        pdfs = {}
+        for stem, input_path in batch.items():
+            pdf_path = temp_dir / f"{stem}.pdf"
+            if pdf_path.exists():
+                pdfs[input_path] = pdf_path
+            else:
+                conversion_logger.warning(f"No PDF generated for {input_path.name} in batch")
+        
+        return pdfs
+    
+    def _run_soffice(self, outdir: Path, input_paths: List[Path], timeout: int) -> Tuple[int, str]:
+        """
+        Convert documents to PDF with headless LibreOffice
+        
+        Each run gets a private, unpredictable profile directory so concurrent
+        workers don't contend for one, and it is removed afterwards.
+        
+        Args:
+            outdir: Directory LibreOffice writes PDFs to
+            input_paths: Documents to convert
+            timeout: Timeout in seconds
+            
+        Returns:
+            Tuple of (return code, stderr tail if the command failed)
+        """
+        profile_dir = Path(tempfile.mkdtemp(prefix='usb-defender-lo-'))
+        
+        try:
+            cmd = [
+                'soffice',
+                f'-env:UserInstallation={profile_dir.as_uri()}',
+                '--headless',
+                '--convert-to', 'pdf',
+                '--outdir', str(outdir),
+                *[str(p) for p in input_paths]
+            ]
+            return _run_quiet(cmd, timeout=timeout)
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    
     def _convert_pdf(self, input_path: Path, output_dir: Path, base_name: str) -> List[Path]:
         """
-        Convert PDF to images using ImageMagick
+        Convert PDF to images using poppler's pdftoppm
+        
+        The untrusted PDF is parsed in a separate process, and each page's
+        resolution is capped so its longest side is at most max_dimension,
+        however large the page claims to be.
         
         Args:
             input_path: Input PDF path
@@ -177,40 +363,103 @@ class DocumentConverter:
         """
         conversion_logger.info(f"Converting PDF {input_path.name} to images")
         
-        # Use ImageMagick to convert PDF to images
-        output_pattern = output_dir / f"{base_name}_%03d.{self.output_format}"
-        
-        cmd = [
-            'convert',
-            '-density', str(self.dpi),
-            '-quality', str(self.jpeg_quality) if self.output_format == 'jpeg' else '100',
-            str(input_path),
-            str(output_pattern)
-        ]
-        
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=180)
-            
-            if result.returncode != 0:
-                conversion_logger.error(f"ImageMagick conversion failed: {result.stderr.decode()}")
+            page_sizes = _pdf_page_sizes(input_path)
+            if not page_sizes:
+                conversion_logger.error(f"No pages found in {input_path.name}")
                 return []
             
-            # Find generated images
-            generated_images = sorted(output_dir.glob(f"{base_name}_*.{self.output_format}"))
+            # Consecutive pages rendering at the same resolution share one run
+            runs = []
+            for page_num, (width, height) in enumerate(page_sizes, 1):
+                dpi = self._page_dpi(width, height)
+                if runs and runs[-1][1] == page_num - 1 and runs[-1][2] == dpi:
+                    runs[-1][1] = page_num
+                else:
+                    runs.append([page_num, page_num, dpi])
             
-            # If only one page, rename to simpler name
-            if len(generated_images) == 1:
-                new_name = output_dir / f"{base_name}.{self.output_format}"
-                generated_images[0].rename(new_name)
-                generated_images = [new_name]
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
+                
+                for first, last, dpi in runs:
+                    returncode, stderr = _run_quiet([
+                        'pdftoppm',
+                        '-r', f'{dpi:.3f}',
+                        '-f', str(first),
+                        '-l', str(last),
+                        str(input_path),
+                        str(temp_path / f'run{first}')
+                    ], timeout=60 + 10 * (last - first + 1))
+                    
+                    if returncode != 0:
+                        conversion_logger.error(f"pdftoppm failed: {stderr}")
+                        return []
+                
+                # Output files are named <prefix>-<page number>.ppm
+                rendered = sorted(temp_path.glob('*.ppm'), key=lambda p: int(p.stem.rsplit('-', 1)[1]))
+                if len(rendered) != len(page_sizes):
+                    conversion_logger.error(
+                        f"pdftoppm rendered {len(rendered)} of {len(page_sizes)} pages"
+                    )
+                    return []
+                
+                generated_images = []
+                for page_num, ppm_path in enumerate(rendered):
+                    # Single page documents get the simpler name
+                    if len(rendered) == 1:
+                        output_path = output_dir / f"{base_name}.{self.output_format}"
+                    else:
+                        output_path = output_dir / f"{base_name}_{page_num:03d}.{self.output_format}"
+                    
+                    with Image.open(ppm_path) as img:
+                        img.save(output_path, **self._save_kwargs())
+                    generated_images.append(output_path)
             
             conversion_logger.info(f"Generated {len(generated_images)} image(s)")
             return generated_images
         
-        except subprocess.TimeoutExpired:
-            conversion_logger.error("PDF conversion timed out")
+        except Exception as e:
+            conversion_logger.error(f"PDF rendering failed: {e}", exc_info=True)
             return []
     
+    def _page_dpi(self, width: float, height: float) -> float:
+        """
+        Get the render resolution for a page, capped by max_dimension
+        
+        Args:
+            width: Page width in points
+            height: Page height in points
+            
+        Returns:
+            Resolution in DPI
+        """
+        longest = max(width, height)
+        if longest <= 0:
+            raise ValueError(f"Invalid page size {width} x {height} pts")
+        
+        # Round down so rounding in pdftoppm cannot exceed the cap
+        return min(float(self.dpi), math.floor(self.max_dimension * 72 * 1000 / longest) / 1000)
+    
+    def _save_kwargs(self) -> dict:
+        """
+        Get encoder options for the configured output format
+        
+        Returns:
+            Keyword arguments for Image.save
+        """
+        save_kwargs = {}
+        if self.output_format in ('jpg', 'jpeg'):
+            save_kwargs['quality'] = self.jpeg_quality
+        elif self.output_format == 'png':
+            save_kwargs['compress_level'] = self.png_compression
+        
+        # The extra optimization pass costs several times the encode time
+        # for a marginal size gain, so it is opt-in
+        if self.optimize_output:
+            save_kwargs['optimize'] = True
+        
+        return save_kwargs
+    
     def _convert_image(self, input_path: Path, output_dir: Path, base_name: str) -> List[Path]:
         """
         Re-encode image to strip metadata and potential threats
@@ -228,6 +477,13 @@ class DocumentConverter:
         try:
             # Open image with PIL
             with Image.open(input_path) as img:
+                # Let libjpeg decode oversized JPEGs at a reduced DCT scale
+                # (1/2 .. 1/8) instead of decoding full resolution first
+                if img.format == 'JPEG' and max(img.size) > self.max_dimension:
+                    scale = self.max_dimension / max(img.size)
+                    target = (math.ceil(img.width * scale), math.ceil(img.height * scale))
+                    img.draft('RGB', target)
+                
                 # Convert to RGB if necessary
                 if img.mode not in ('RGB', 'L'):
                     conversion_logger.debug(f"Converting image mode from {img.mode} to RGB")
@@ -236,20 +492,12 @@ class DocumentConverter:
                 # Resize if too large
                 if max(img.size) > self.max_dimension:
                     conversion_logger.info(f"Resizing image from {img.size}")
-                    img.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+                    img.thumbnail((self.max_dimension, self.max_dimension), self.resample)
                 
                 # Save with new encoding (strips metadata)
                 output_path = output_dir / f"{base_name}.{self.output_format}"
                 
-                save_kwargs = {}
-                if self.output_format in ('jpg', 'jpeg'):
-                    save_kwargs['quality'] = self.jpeg_quality
-                    save_kwargs['optimize'] = True
-                elif self.output_format == 'png':
-                    save_kwargs['compress_level'] = self.png_compression
-                    save_kwargs['optimize'] = True
-                
-                img.save(output_path, **save_kwargs)
+                img.save(output_path, **self._save_kwargs())
                 
                 conversion_logger.info(f"Image saved to {output_path}")
                 return [output_path]
@@ -277,19 +525,16 @@ class DocumentConverter:
             with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
                 text = f.read(100000)  # Limit to 100KB
             
-            # Create image with text using PIL
-            from PIL import ImageDraw, ImageFont
-            
             # Calculate image size based on text
             font_size = 14
             line_height = font_size + 4
             max_width = 800
             
             # Try to use a monospace font
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", font_size)
-            except Exception:
-                font = ImageFont.load_default()
+            font = _load_font("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", font_size)
+            
+            # Measure each distinct character once for word wrapping
+            char_widths = {ch: font.getlength(ch) for ch in set(text)}
             
             # Wrap text
             lines = []
@@ -303,7 +548,7 @@ class DocumentConverter:
                 current_line = ''
                 for word in words:
                     test_line = f"{current_line} {word}".strip()
-                    if len(test_line) * (font_size // 2) > max_width:
+                    if sum(char_widths[c] for c in test_line) > max_width:
                         if current_line:
                             lines.append(current_line)
                         current_line = word
@@ -321,22 +566,15 @@ class DocumentConverter:
             img = Image.new('RGB', (max_width + 40, img_height), color='white')
             draw = ImageDraw.Draw(img)
             
-            # Draw text
-            y = 20
-            for line in lines:
-                draw.text((20, y), line, fill='black', font=font)
-                y += line_height
+            # Draw all lines in one call; Pillow advances each line by the
+            # height of "A" plus spacing, so pad that out to line_height
+            spacing = line_height - draw.textbbox((0, 0), "A", font=font)[3]
+            draw.multiline_text((20, 20), '\n'.join(lines), fill='black', font=font, spacing=spacing)
             
             # Save image
             output_path = output_dir / f"{base_name}.{self.output_format}"
             
-            save_kwargs = {}
-            if self.output_format in ('jpg', 'jpeg'):
-                save_kwargs['quality'] = self.jpeg_quality
-            elif self.output_format == 'png':
-                save_kwargs['compress_level'] = self.png_compression
-            
-            img.save(output_path, **save_kwargs)
+            img.save(output_path, **self._save_kwargs())
             
             conversion_logger.info(f"Text converted to image: {output_path}")
             return [output_path]
@@ -1,16 +1,30 @@
 """
 USB Defender Kiosk - Dashboard Authentication
 Simple authentication for admin dashboard
+
+Generate a hash for the dashboard 'password' config key with:
+    python -m src.dashboard.auth <password>
 """
 
+import getpass
 import hashlib
-from typing import Optional
+import hmac
+import os
+import sys
+from typing import Optional, Tuple
 from src.utils.logger import KioskLogger
 
 
 logger = KioskLogger.get_logger(__name__)
 
 
+# scrypt parameters (~16 MiB of memory per derivation)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+
 class DashboardAuth:
     """Simple authentication for dashboard access"""
     
@@ -23,6 +37,7 @@ class DashboardAuth:
         """
         self.config = config
         self.password_hash = self._get_password_hash()
+        self._salt, self._digest = self._parse_hash(self.password_hash)
         self.session_timeout = config.get('session_timeout', 15) * 60  # Convert to seconds
     
     def _get_password_hash(self) -> str:
@@ -36,22 +51,72 @@ class DashboardAuth:
         
         # Check if it's already hashed (starts with hash marker)
         if password.startswith('$hash$'):
-            return password[6:]  # Remove marker
+            password_hash = password[6:]  # Remove marker
+            if '$' not in password_hash:
+                logger.warning(
+                    "Dashboard password uses a legacy unsalted SHA-256 hash; "
+                    "regenerate it with: python -m src.dashboard.auth <password>"
+                )
+            return password_hash
         
         # Hash the password
         return self._hash_password(password)
     
-    def _hash_password(self, password: str) -> str:
+    @staticmethod
+    def _hash_password(password: str) -> str:
         """
-        Hash password using SHA-256
+        Hash password using scrypt with a random salt
         
         Args:
             password: Plain text password
             
         Returns:
-            Hashed password
+            Hashed password as "salt$hash" in hex
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        salt = os.urandom(16)
+        return f"{salt.hex()}${DashboardAuth._derive(password, salt).hex()}"
+    
+    def _parse_hash(self, password_hash: str) -> Tuple[Optional[bytes], bytes]:
+        """
+        Split a stored hash into salt and digest
+        
+        Hashes without a salt are legacy unsalted SHA-256 digests.
+        
+        Args:
+            password_hash: Stored hash (without marker)
+            
+        Returns:
+            Tuple of (salt or None, digest)
+        """
+        if '$' in password_hash:
+            salt_hex, digest_hex = password_hash.split('$', 1)
+            return bytes.fromhex(salt_hex), bytes.fromhex(digest_hex)
+        
+        return None, bytes.fromhex(password_hash)
+    
+    @staticmethod
+    def _derive(password: str, salt: Optional[bytes]) -> bytes:
+        """
+        Derive the digest of a password
+        
+        Args:
+            password: Plain text password
+            salt: scrypt salt, or None for a legacy SHA-256 hash
+            
+        Returns:
+            Raw digest
+        """
+        if salt is None:
+            return hashlib.sha256(password.encode()).digest()
+        
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=SCRYPT_N,
+            r=SCRYPT_R,
+            p=SCRYPT_P,
+            dklen=SCRYPT_DKLEN
+        )
     
     def verify_password(self, password: str) -> bool:
         """
@@ -63,9 +128,10 @@ class DashboardAuth:
         Returns:
             True if password is correct
         """
-        password_hash = self._hash_password(password)
+        # Compare raw digests in constant time to avoid leaking timing information
+        candidate = self._derive(password, self._salt)
         
-        is_valid = password_hash == self.password_hash
+        is_valid = hmac.compare_digest(candidate, self._digest)
         
         if is_valid:
             logger.info("Dashboard authentication successful")
@@ -89,9 +155,23 @@ class DashboardAuth:
             return False
         
         self.password_hash = self._hash_password(new_password)
+        self._salt, self._digest = self._parse_hash(self.password_hash)
         
         # TODO: Update config file with new hashed password
         logger.info("Dashboard password changed")
         
         return True
 
+
+def main():
+    """Print a config-ready hash of the password given on the command line, or prompted for"""
+    if len(sys.argv) > 2:
+        print("Usage: python -m src.dashboard.auth [password]", file=sys.stderr)
+        sys.exit(2)
+    
+    password = sys.argv[1] if len(sys.argv) == 2 else getpass.getpass("Dashboard password: ")
+    print(f"$hash${DashboardAuth._hash_password(password)}")
+
+
+if __name__ == '__main__':
+    main()
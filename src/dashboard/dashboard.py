@@ -5,31 +5,244 @@ Administration and monitoring interface
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-    QTextEdit, QPushButton, QLabel, QTableWidget, QTableWidgetItem,
-    QLineEdit, QDialog, QDialogButtonBox, QFormLayout, QMessageBox
+    QTextEdit, QPlainTextEdit, QPushButton, QLabel, QTableView,
+    QLineEdit, QDialog, QDialogButtonBox, QFormLayout, QMessageBox, QProgressDialog,
+    QHeaderView
+)
+from PyQt6.QtCore import (
+    Qt, QEvent, QTimer, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal,
+    QFileSystemWatcher
 )
-from PyQt6.QtCore import Qt, QTimer
 from pathlib import Path
+from typing import Callable, List, Tuple
+from collections import deque
 from datetime import datetime
+import functools
+import re
+import shutil
 import subprocess
+import threading
+import time
 
 from src.dashboard.auth import DashboardAuth
 from src.utils.logger import KioskLogger
 from src.utils.config import ConfigManager
+from src.utils.file_utils import tail_lines, human_bytes
 
 
 logger = KioskLogger.get_logger(__name__)
 
 
+# Log files shown in the logs tab; the audit log also feeds recent transfers
+LOG_DIR = '/var/log/usb-defender'
+LOG_FILES = {
+    'app': f'{LOG_DIR}/app.log',
+    'audit': f'{LOG_DIR}/audit.log',
+    'transfer': f'{LOG_DIR}/transfer.log'
+}
+
+# Services shown on the overview tab
+MONITORED_SERVICES = ['clamav-daemon', 'udisks2']
+
+# Seconds a service status query stays valid
+SERVICE_STATUS_TTL = 30
+
+# Session start/end entries as written by KioskLogger.audit, e.g.
+# "2024-01-01 12:00:00 - INFO - SESSION_ENDED | session_id=x | files=3 | status=SUCCESS"
+_AUDIT_RE = re.compile(
+    rb'^(?P<ts>\S+ \S+) - \w+ - (?P<event>SESSION_STARTED|SESSION_ENDED)'
+    rb' \| session_id=(?P<sid>[^\s|]+)'
+    rb'(?: \| files=(?P<files>\d+))?'
+    rb'(?: \| status=(?P<status>[^\s|]+))?',
+    re.MULTILINE
+)
+
+# Minimum seconds between login attempts
+LOGIN_ATTEMPT_INTERVAL = 0.3
+
+# Sessions kept in the recent transfers table
+RECENT_SESSIONS = 100
+
+# Status probe interval while the dashboard is visible (logs are watched instead)
+REFRESH_INTERVAL_MS = 30000
+
+# Delay that batches bursts of log writes into one reload
+LOG_WATCH_DELAY_MS = 250
+
+# clamav-daemon unit properties shown on the system tab
+CLAMAV_PROPERTIES = 'ActiveState,SubState,MainPID,ExecMainStartTimestamp'
+
+# Seconds ClamAV status and disk usage stay valid between refreshes
+SYSTEM_INFO_TTL = 30
+
+# Dashboard styles, parsed once for the whole window; widgets opt in via a "role" property
+DASHBOARD_QSS = """
+QLabel[role="title"] { font-size: 20pt; font-weight: bold; margin: 10px; }
+QLabel[role="dialog-title"] { font-size: 16pt; font-weight: bold; margin-bottom: 10px; }
+QLabel[role="section"] { font-size: 14pt; font-weight: bold; }
+QPlainTextEdit[role="log"] { font-family: monospace; }
+"""
+
+
+def ttl_cache(seconds: float) -> Callable:
+    """
+    Cache a method's result per instance for a number of seconds
+    
+    The wrapped method takes an extra force=True keyword to bypass the cache,
+    and the wrapper gains invalidate(instance) to drop the cached entry.
+    
+    Args:
+        seconds: How long a result stays valid
+        
+    Returns:
+        Method decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, force: bool = False, **kwargs):
+            cache = self.__dict__.setdefault('_ttl_cache', {})
+            entry = cache.get(func.__name__)
+            
+            if not force and entry is not None and time.monotonic() - entry['ts'] < seconds:
+                return entry['value']
+            
+            value = func(self, *args, **kwargs)
+            cache[func.__name__] = {'ts': time.monotonic(), 'value': value}
+            return value
+        
+        wrapper.invalidate = lambda instance: instance.__dict__.get('_ttl_cache', {}).pop(func.__name__, None)
+        return wrapper
+    
+    return decorator
+
+
+class JobSignals(QObject):
+    """Signals for thread pool jobs (QRunnable cannot define signals)"""
+    
+    finished = pyqtSignal(list)
+
+
+class SystemStatusJob(QRunnable):
+    """Queries service states with a single systemctl call off the GUI thread"""
+    
+    def __init__(self, services: List[str]):
+        super().__init__()
+        self.services = services
+        self.signals = JobSignals()
+    
+    def run(self):
+        """Run systemctl and emit (service, state) pairs"""
+        states = []
+        try:
+            # is-active prints one state per unit, in argument order
+            result = subprocess.run(
+                ['systemctl', 'is-active', *self.services],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            states = result.stdout.split()
+        except Exception:
+            pass
+        
+        if len(states) != len(self.services):
+            states = ['unknown'] * len(self.services)
+        
+        self.signals.finished.emit(list(zip(self.services, states)))
+
+
+class SubprocessSignals(QObject):
+    """Signals for SubprocessJob"""
+    
+    finished = pyqtSignal(int, str, str)
+
+
+class SubprocessJob(QRunnable):
+    """Runs a command off the GUI thread and emits (returncode, stdout, stderr)"""
+    
+    def __init__(self, argv: List[str], timeout: int):
+        super().__init__()
+        self.argv = argv
+        self.timeout = timeout
+        self.signals = SubprocessSignals()
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Kill the command if it is still running"""
+        self._cancelled.set()
+    
+    def run(self):
+        """Run the command, polling for cancellation and timeout"""
+        try:
+            proc = subprocess.Popen(
+                self.argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except Exception as e:
+            self.signals.finished.emit(-1, '', str(e))
+            return
+        
+        deadline = time.monotonic() + self.timeout
+        
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                if self._cancelled.is_set() or time.monotonic() > deadline:
+                    proc.kill()
+                    stdout, _ = proc.communicate()
+                    reason = "Cancelled" if self._cancelled.is_set() else f"Timed out after {self.timeout}s"
+                    self.signals.finished.emit(-1, stdout, reason)
+                    return
+        
+        self.signals.finished.emit(proc.returncode, stdout, stderr)
+
+
+class PasswordCheckSignals(QObject):
+    """Signals for PasswordCheckJob"""
+    
+    finished = pyqtSignal(bool)
+
+
+class PasswordCheckJob(QRunnable):
+    """Verifies a password off the GUI thread (the KDF is deliberately slow)"""
+    
+    def __init__(self, auth: DashboardAuth, password: str):
+        super().__init__()
+        self.auth = auth
+        self.password = password
+        self.signals = PasswordCheckSignals()
+    
+    def run(self):
+        """Verify the password and emit the result"""
+        try:
+            valid = self.auth.verify_password(self.password)
+        except Exception as e:
+            logger.error(f"Error verifying password: {e}")
+            valid = False
+        
+        self.password = None
+        self.signals.finished.emit(valid)
+
+
 class LoginDialog(QDialog):
     """Login dialog for dashboard access"""
     
-    def __init__(self, auth: DashboardAuth, parent=None):
+    def __init__(self, dashboard_config: dict, parent=None):
         super().__init__(parent)
         
-        self.auth = auth
+        # Created once the dialog is up, so a bad config can't stop it appearing
+        self._dashboard_config = dashboard_config
+        self.auth = None
         self.authenticated = False
         
+        # In-flight verification and when the last one was started
+        self._check_job = None
+        self._last_attempt_ts = 0.0
+        
         self.setWindowTitle("Dashboard Login")
         self.setModal(True)
         self.setMinimumWidth(300)
@@ -38,7 +251,7 @@ class LoginDialog(QDialog):
         
         # Title
         title = QLabel("Admin Dashboard Access")
-        title.setStyleSheet("font-size: 16pt; font-weight: bold; margin-bottom: 10px;")
+        title.setProperty('role', 'dialog-title')
         layout.addWidget(title)
         
         # Password field
@@ -57,45 +270,181 @@ class LoginDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
         
+        self.ok_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        
         self.password_field.setFocus()
+        
+        QTimer.singleShot(0, self._init_auth)
+    
+    def _init_auth(self):
+        """Create the authenticator after the dialog is shown"""
+        try:
+            self.auth = DashboardAuth(self._dashboard_config)
+        except Exception as e:
+            logger.error(f"Error initializing dashboard authentication: {e}")
+            QMessageBox.critical(self, "Error", f"Dashboard authentication unavailable:\n{e}")
+            self.reject()
     
     def check_password(self):
         """Check entered password"""
+        now = time.monotonic()
+        if self.auth is None or self._check_job is not None or now - self._last_attempt_ts < LOGIN_ATTEMPT_INTERVAL:
+            return
+        
+        self._last_attempt_ts = now
+        
+        # Don't leave the plaintext sitting in the field while verifying
         password = self.password_field.text()
+        self.password_field.clear()
+        self.password_field.setEnabled(False)
+        self.ok_button.setEnabled(False)
+        
+        self._check_job = PasswordCheckJob(self.auth, password)
+        self._check_job.signals.finished.connect(self._on_password_checked)
+        QThreadPool.globalInstance().start(self._check_job)
+    
+    def _on_password_checked(self, valid: bool):
+        """
+        Handle the result of a finished password check
+        
+        Args:
+            valid: Whether the password was correct
+        """
+        self._check_job = None
+        self.password_field.setEnabled(True)
+        self.ok_button.setEnabled(True)
         
-        if self.auth.verify_password(password):
+        if valid:
             self.authenticated = True
             self.accept()
         else:
             QMessageBox.warning(self, "Access Denied", "Incorrect password")
-            self.password_field.clear()
             self.password_field.setFocus()
 
 
+class TransfersModel(QAbstractTableModel):
+    """Table model over the dashboard's recent session records"""
+    
+    HEADERS = ["Time", "Session ID", "Files", "Status"]
+    
+    def __init__(self, sessions: deque, parent=None):
+        super().__init__(parent)
+        
+        # [time, session_id, files, status] per row, updated in place by the dashboard
+        self.sessions = sessions
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.sessions)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.sessions[index.row()][index.column()]
+        return None
+    
+    def reload(self):
+        """Notify views that rows were added, evicted or replaced"""
+        self.beginResetModel()
+        self.endResetModel()
+    
+    def sessions_changed(self, added: bool, updated: set):
+        """
+        Notify views of a batch of session changes with a single signal
+        
+        Args:
+            added: Whether sessions were appended (and possibly evicted)
+            updated: Ids of sessions updated in place
+        """
+        if added:
+            # Rows shifted; a reset is one relayout instead of per-row moves
+            self.reload()
+            return
+        
+        rows = [row for row, record in enumerate(self.sessions) if record[1] in updated]
+        if rows:
+            # One range spanning all columns of every changed row
+            self.dataChanged.emit(self.index(rows[0], 0), self.index(rows[-1], len(self.HEADERS) - 1))
+
+
 class DashboardWindow(QMainWindow):
     """Admin dashboard window"""
     
     def __init__(self, config: ConfigManager):
         super().__init__()
         
+        # Cascades to every child widget, including the login dialog
+        self.setStyleSheet(DASHBOARD_QSS)
+        
         self.config = config
-        self.auth = DashboardAuth(config.get_dashboard_config())
+        self.auth = None
+        self.authenticated = False
+        
+        # Audit log position parsed so far
+        self._audit_state = {'size': 0, 'ino': None}
+        
+        # Recent session records, oldest evicted first, indexed by session id
+        self._sessions_deque = deque(maxlen=RECENT_SESSIONS)
+        self._sessions_by_id = {}
+        
+        # (timestamp, [(service, state), ...]) from the last SystemStatusJob
+        self._service_states = None
+        self._status_job = None
+        
+        # In-flight SubprocessJobs, kept referenced until they report back
+        self._clamav_job = None
+        self._update_job = None
+        self._restart_job = None
+        self._update_progress = None
+        
+        # (log_type, inode, bytes shown) of the log currently in the viewer
+        self._shown_log = None
+        
+        # Tabs are populated on first activation (Overview, Logs, System)
+        self._tab_loaded = [False, False, False]
+        
+        # Set while a refresh is queued, so bursts of triggers run it once
+        self._refresh_pending = False
+        self._refresh_force = False
+        
+        # Watched log paths changed since the last reload
+        self._changed_logs = set()
         
-        # Authenticate user
-        login_dialog = LoginDialog(self.auth, self)
+        # Authenticate user before building any of the dashboard
+        login_dialog = LoginDialog(config.get_dashboard_config(), self)
         if login_dialog.exec() != QDialog.DialogCode.Accepted or not login_dialog.authenticated:
-            self.close()
+            self.deleteLater()
             return
         
+        self.auth = login_dialog.auth
+        self.authenticated = True
+        
         self._init_ui()
+        self._start_refresh()
+        
+        logger.info("Dashboard opened")
+    
+    def _start_refresh(self):
+        """Load the initial tab and start timer and log watcher driven refreshes"""
         self._load_data()
         
-        # Auto-refresh timer
+        # Auto-refresh timer, only running while there is something visible to refresh
         self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self._refresh_data)
-        self.refresh_timer.start(10000)  # Refresh every 10 seconds
-        
-        logger.info("Dashboard opened")
+        self.refresh_timer.timeout.connect(self._schedule_refresh)
+        self.tabs.currentChanged.connect(self._update_refresh_timer)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        
+        # Reload logs when they are written rather than by polling
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_log_changed)
+        self._watcher.directoryChanged.connect(self._watch_logs)
+        self._watch_logs()
     
     def _init_ui(self):
         """Initialize user interface"""
@@ -110,7 +459,7 @@ class DashboardWindow(QMainWindow):
         
         # Title
         title = QLabel("USB Defender Admin Dashboard")
-        title.setStyleSheet("font-size: 20pt; font-weight: bold; margin: 10px;")
+        title.setProperty('role', 'title')
         layout.addWidget(title)
         
         # Tabs
@@ -130,7 +479,7 @@ class DashboardWindow(QMainWindow):
         button_layout = QHBoxLayout()
         
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self._refresh_data)
+        refresh_btn.clicked.connect(lambda: self._schedule_refresh(force=True))
         button_layout.addWidget(refresh_btn)
         
         button_layout.addStretch()
@@ -148,7 +497,7 @@ class DashboardWindow(QMainWindow):
         
         # System status
         status_label = QLabel("System Status")
-        status_label.setStyleSheet("font-size: 14pt; font-weight: bold;")
+        status_label.setProperty('role', 'section')
         layout.addWidget(status_label)
         
         self.status_text = QTextEdit()
@@ -157,13 +506,18 @@ class DashboardWindow(QMainWindow):
         layout.addWidget(self.status_text)
         
         # Recent transfers
+        layout.addSpacing(20)
         transfers_label = QLabel("Recent Transfers")
-        transfers_label.setStyleSheet("font-size: 14pt; font-weight: bold; margin-top: 20px;")
+        transfers_label.setProperty('role', 'section')
         layout.addWidget(transfers_label)
         
-        self.transfers_table = QTableWidget()
-        self.transfers_table.setColumnCount(4)
-        self.transfers_table.setHorizontalHeaderLabels(["Time", "Session ID", "Files", "Status"])
+        self.transfers_model = TransfersModel(self._sessions_deque, self)
+        self.transfers_table = QTableView()
+        self.transfers_table.setModel(self.transfers_model)
+        
+        # Single-line rows: fixed heights so Qt never measures row contents
+        self.transfers_table.setWordWrap(False)
+        self.transfers_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         layout.addWidget(self.transfers_table)
         
         return widget
@@ -193,10 +547,11 @@ class DashboardWindow(QMainWindow):
         layout.addLayout(log_buttons)
         
         # Log display
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        self.log_text.setStyleSheet("font-family: monospace;")
+        self.log_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.log_text.document().setMaximumBlockCount(5000)  # Drop oldest lines beyond this
+        self.log_text.setProperty('role', 'log')
         layout.addWidget(self.log_text)
         
         return widget
@@ -208,7 +563,7 @@ class DashboardWindow(QMainWindow):
         
         # ClamAV status
         clamav_label = QLabel("ClamAV Status")
-        clamav_label.setStyleSheet("font-size: 14pt; font-weight: bold;")
+        clamav_label.setProperty('role', 'section')
         layout.addWidget(clamav_label)
         
         self.clamav_status = QTextEdit()
@@ -232,8 +587,9 @@ class DashboardWindow(QMainWindow):
         layout.addLayout(clamav_buttons)
         
         # Disk space
+        layout.addSpacing(20)
         disk_label = QLabel("Disk Space")
-        disk_label.setStyleSheet("font-size: 14pt; font-weight: bold; margin-top: 20px;")
+        disk_label.setProperty('role', 'section')
         layout.addWidget(disk_label)
         
         self.disk_info = QTextEdit()
@@ -246,48 +602,110 @@ class DashboardWindow(QMainWindow):
         return widget
     
     def _load_data(self):
-        """Load dashboard data"""
-        self._load_system_status()
-        self._load_recent_transfers()
-        self._load_log('app')
-        self._load_clamav_status()
-        self._load_disk_info()
-    
-    def _refresh_data(self):
-        """Refresh dashboard data"""
+        """Load dashboard data for the current tab; the others load when first opened"""
+        self._on_tab_changed(self.tabs.currentIndex())
+    
+    def _on_tab_changed(self, index: int):
+        """
+        Load a tab's data the first time it is shown
+        
+        Args:
+            index: Index of the newly current tab
+        """
+        if index < 0 or self._tab_loaded[index]:
+            return
+        
+        self._tab_loaded[index] = True
+        
+        if index == 1:  # Logs
+            self._load_log('app')
+        else:
+            self._refresh_data()
+    
+    def _schedule_refresh(self, force: bool = False):
+        """
+        Queue a refresh, coalescing with one that is already queued
+        
+        Args:
+            force: Bypass cached status (explicit Refresh click)
+        """
+        self._refresh_force = self._refresh_force or force
+        
+        if self._refresh_pending:
+            return
+        
+        self._refresh_pending = True
+        QTimer.singleShot(0, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run a queued refresh"""
+        force = self._refresh_force
+        self._refresh_pending = False
+        self._refresh_force = False
+        self._refresh_data(force=force)
+    
+    def _refresh_data(self, force: bool = False):
+        """
+        Refresh dashboard data
+        
+        Args:
+            force: Bypass cached status
+        """
         current_tab = self.tabs.currentIndex()
         
         if current_tab == 0:  # Overview
-            self._load_system_status()
+            self._load_system_status(force=force)
             self._load_recent_transfers()
         elif current_tab == 1:  # Logs
             # Don't auto-refresh logs
             pass
         elif current_tab == 2:  # System
-            self._load_clamav_status()
-            self._load_disk_info()
+            self._load_clamav_status(force=force)
+            self._load_disk_info(force=force)
+    
+    def _load_system_status(self, force: bool = False):
+        """
+        Load system status information
+        
+        Args:
+            force: Query services even if the cached states are still fresh
+        """
+        cached = self._service_states
+        if not force and cached is not None and time.monotonic() - cached[0] < SERVICE_STATUS_TTL:
+            self._show_system_status(cached[1])
+            return
+        
+        # Query services off the GUI thread; the result arrives via signal
+        if self._status_job is None:
+            self._status_job = SystemStatusJob(MONITORED_SERVICES)
+            self._status_job.signals.finished.connect(self._apply_system_status)
+            QThreadPool.globalInstance().start(self._status_job)
+    
+    def _apply_system_status(self, states: list):
+        """
+        Cache and display service states from a finished SystemStatusJob
+        
+        Args:
+            states: (service, state) pairs
+        """
+        self._status_job = None
+        self._service_states = (time.monotonic(), states)
+        self._show_system_status(states)
     
-    def _load_system_status(self):
-        """Load system status information"""
+    def _show_system_status(self, states: list):
+        """
+        Render system status information
+        
+        Args:
+            states: (service, state) pairs
+        """
         status = []
         
         # Current time
         status.append(f"Current Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Check if services are running
-        services = ['clamav-daemon', 'udisks2']
-        for service in services:
-            try:
-                result = subprocess.run(
-                    ['systemctl', 'is-active', service],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                state = result.stdout.strip()
-                status.append(f"{service}: {state}")
-            except Exception:
-                status.append(f"{service}: unknown")
+        for service, state in states:
+            status.append(f"{service}: {state}")
         
         # Transfer destination
         transfer_config = self.config.get_transfer_config()
@@ -299,50 +717,87 @@ class DashboardWindow(QMainWindow):
     def _load_recent_transfers(self):
         """Load recent transfer information"""
         # Read from audit log
-        audit_log = Path('/var/log/usb-defender/audit.log')
+        audit_log = Path(LOG_FILES['audit'])
         
         if not audit_log.exists():
             return
         
         try:
-            # Read last 100 lines
-            with open(audit_log, 'r') as f:
-                lines = f.readlines()[-100:]
+            st = audit_log.stat()
+            state = self._audit_state
             
-            # Parse transfer sessions
-            sessions = {}
-            for line in lines:
-                if 'SESSION_STARTED' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 3:
-                        timestamp = parts[0].strip()
-                        session_id = parts[2].split('=')[1].strip() if '=' in parts[2] else ''
-                        sessions[session_id] = {
-                            'time': timestamp,
-                            'files': 0,
-                            'status': 'In Progress'
-                        }
-                elif 'SESSION_ENDED' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 5:
-                        session_id = parts[2].split('=')[1].strip() if '=' in parts[2] else ''
-                        if session_id in sessions:
-                            files = parts[3].split('=')[1].strip() if '=' in parts[3] else '0'
-                            status = parts[4].split('=')[1].strip() if '=' in parts[4] else 'UNKNOWN'
-                            sessions[session_id]['files'] = files
-                            sessions[session_id]['status'] = status
+            if st.st_ino != state['ino'] or st.st_size < state['size']:
+                # First load, rotation or truncation: start over from the tail
+                state['ino'] = st.st_ino
+                state['size'] = st.st_size
+                self._sessions_deque.clear()
+                self._sessions_by_id.clear()
+                self._parse_audit_entries(tail_lines(audit_log, 100))
+                self.transfers_model.reload()
+                return
+            
+            if st.st_size == state['size']:
+                # Nothing new
+                return
+            
+            # Append-only: parse just the bytes written since last time
+            with open(audit_log, 'rb') as f:
+                f.seek(state['size'])
+                new_bytes = f.read(st.st_size - state['size'])
+            
+            # Leave a partially written last line for the next refresh
+            complete = new_bytes.rfind(b'\n') + 1
+            state['size'] += complete
+            added, updated = self._parse_audit_entries(new_bytes[:complete])
             
             # Update table
-            self.transfers_table.setRowCount(len(sessions))
-            for i, (session_id, data) in enumerate(sessions.items()):
-                self.transfers_table.setItem(i, 0, QTableWidgetItem(data['time']))
-                self.transfers_table.setItem(i, 1, QTableWidgetItem(session_id))
-                self.transfers_table.setItem(i, 2, QTableWidgetItem(str(data['files'])))
-                self.transfers_table.setItem(i, 3, QTableWidgetItem(data['status']))
+            self.transfers_model.sessions_changed(added, updated)
         
         except Exception as e:
             logger.error(f"Error loading recent transfers: {e}")
     
+    def _parse_audit_entries(self, data: bytes) -> Tuple[bool, set]:
+        """
+        Update the recent session records from raw audit log data
+        
+        Args:
+            data: Complete audit log lines as bytes
+            
+        Returns:
+            Tuple of (whether sessions were added, ids of sessions updated in place)
+        """
+        sessions = self._sessions_deque
+        by_id = self._sessions_by_id
+        added = False
+        updated = set()
+        
+        # Lines without a session event are skipped by the regex engine itself
+        for match in _AUDIT_RE.finditer(data):
+            session_id = match['sid'].decode('utf-8', 'replace')
+            record = by_id.get(session_id)
+            
+            if match['event'] == b'SESSION_STARTED':
+                timestamp = match['ts'].decode('ascii', 'replace')
+                if record is not None:
+                    record[:] = [timestamp, session_id, '0', 'In Progress']
+                    updated.add(session_id)
+                    continue
+                
+                # A full deque drops its oldest record on append
+                if len(sessions) == sessions.maxlen:
+                    del by_id[sessions[0][1]]
+                record = [timestamp, session_id, '0', 'In Progress']
+                sessions.append(record)
+                by_id[session_id] = record
+                added = True
+            elif record is not None:
+                files, status = match['files'], match['status']
+                record[2] = files.decode('ascii') if files else '0'
+                record[3] = status.decode('utf-8', 'replace') if status else 'UNKNOWN'
+                updated.add(session_id)
+        
+        return added, updated
+    
     def _load_log(self, log_type: str):
         """
         Load and display log file
@@ -350,24 +805,37 @@ class DashboardWindow(QMainWindow):
         Args:
             log_type: Type of log (app, audit, transfer)
         """
-        log_files = {
-            'app': '/var/log/usb-defender/app.log',
-            'audit': '/var/log/usb-defender/audit.log',
-            'transfer': '/var/log/usb-defender/transfer.log'
-        }
-        
-        log_file = Path(log_files.get(log_type, ''))
+        log_file = Path(LOG_FILES.get(log_type, ''))
         
         if not log_file.exists():
+            self._shown_log = None
             self.log_text.setPlainText(f"Log file not found: {log_file}")
             return
         
         try:
-            # Read last 500 lines
-            with open(log_file, 'r') as f:
-                lines = f.readlines()[-500:]
+            st = log_file.stat()
+            shown = self._shown_log
             
-            self.log_text.setPlainText(''.join(lines))
+            if shown is None or shown[0] != log_type or shown[1] != st.st_ino or st.st_size < shown[2]:
+                # Different log, or rotated/truncated: show the last 500 lines
+                tail = tail_lines(log_file, 500)
+                self.log_text.setPlainText(tail.removesuffix(b'\n').decode('utf-8', 'replace'))
+                self._shown_log = (log_type, st.st_ino, st.st_size)
+            elif st.st_size > shown[2]:
+                # Same log grew: append only the new complete lines
+                with open(log_file, 'rb') as f:
+                    f.seek(shown[2])
+                    new_bytes = f.read(st.st_size - shown[2])
+                
+                complete = new_bytes.rfind(b'\n') + 1
+                if not complete:
+                    return
+                
+                self.log_text.appendPlainText(new_bytes[:complete - 1].decode('utf-8', 'replace'))
+                self._shown_log = (log_type, st.st_ino, shown[2] + complete)
+            else:
+                # Already showing this log unchanged
+                return
             
             # Scroll to bottom
             self.log_text.verticalScrollBar().setValue(
@@ -375,91 +843,223 @@ class DashboardWindow(QMainWindow):
             )
         
         except Exception as e:
+            self._shown_log = None
             self.log_text.setPlainText(f"Error reading log: {e}")
     
-    def _load_clamav_status(self):
-        """Load ClamAV status"""
-        status = []
+    def _watch_logs(self):
+        """Watch the log directory and any log files not yet watched"""
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        
+        # Rotated or recreated files drop out of the watcher and are re-added here
+        missing = [
+            path for path in (LOG_DIR, *LOG_FILES.values())
+            if path not in watched and Path(path).exists()
+        ]
+        if missing:
+            self._watcher.addPaths(missing)
+    
+    def _on_log_changed(self, path: str):
+        """
+        Queue a reload for a changed log file
         
-        try:
-            # Check service status
-            result = subprocess.run(
-                ['systemctl', 'status', 'clamav-daemon'],
-                capture_output=True,
-                text=True,
+        Args:
+            path: Changed log file
+        """
+        if path not in self._watcher.files():
+            self._watch_logs()
+        
+        if not self._changed_logs:
+            QTimer.singleShot(LOG_WATCH_DELAY_MS, self._reload_changed_logs)
+        self._changed_logs.add(path)
+    
+    def _reload_changed_logs(self):
+        """Update views that show a log which changed"""
+        changed = self._changed_logs
+        self._changed_logs = set()
+        
+        if LOG_FILES['audit'] in changed and self._tab_loaded[0]:
+            self._load_recent_transfers()
+        
+        # Appends only the new lines of the log in the viewer
+        if self._shown_log is not None and LOG_FILES[self._shown_log[0]] in changed:
+            self._load_log(self._shown_log[0])
+    
+    @ttl_cache(SYSTEM_INFO_TTL)
+    def _load_clamav_status(self):
+        """Load ClamAV status (the view keeps the last result while cached)"""
+        # Query off the GUI thread; the result arrives via signal
+        if self._clamav_job is None:
+            # Stable key=value properties; unlike `systemctl status` this skips the journal
+            self._clamav_job = SubprocessJob(
+                ['systemctl', 'show', '-p', CLAMAV_PROPERTIES, 'clamav-daemon'],
                 timeout=5
             )
-            
-            # Parse output
-            for line in result.stdout.split('\n')[:10]:
-                status.append(line)
+            self._clamav_job.signals.finished.connect(self._apply_clamav_status)
+            QThreadPool.globalInstance().start(self._clamav_job)
+    
+    def _apply_clamav_status(self, returncode: int, stdout: str, stderr: str):
+        """
+        Display the output of a finished ClamAV status query
         
-        except Exception as e:
-            status.append(f"Error checking ClamAV status: {e}")
+        Args:
+            returncode: systemctl exit code (-1 if it could not run)
+            stdout: systemctl show output
+            stderr: systemctl error output
+        """
+        self._clamav_job = None
+        
+        if returncode < 0:
+            self.clamav_status.setPlainText(f"Error checking ClamAV status: {stderr}")
+            return
+        
+        # Parse KEY=value lines
+        props = dict(line.split('=', 1) for line in stdout.splitlines() if '=' in line)
+        
+        status = [
+            f"State: {props.get('ActiveState', 'unknown')} ({props.get('SubState', 'unknown')})",
+            f"Main PID: {props.get('MainPID') or 'n/a'}",
+            f"Started: {props.get('ExecMainStartTimestamp') or 'n/a'}"
+        ]
         
         self.clamav_status.setPlainText('\n'.join(status))
     
+    @ttl_cache(SYSTEM_INFO_TTL)
     def _load_disk_info(self):
-        """Load disk space information"""
-        try:
-            result = subprocess.run(
-                ['df', '-h', '/var/usb-defender', '/var/log/usb-defender'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            self.disk_info.setPlainText(result.stdout)
+        """Load disk space information (the view keeps the last result while cached)"""
+        lines = []
         
-        except Exception as e:
-            self.disk_info.setPlainText(f"Error checking disk space: {e}")
+        for path in ('/var/usb-defender', LOG_DIR):
+            try:
+                usage = shutil.disk_usage(path)
+                percent = usage.used / usage.total * 100 if usage.total else 0
+                lines.append(
+                    f"{path}: {human_bytes(usage.used)} used of {human_bytes(usage.total)} "
+                    f"({human_bytes(usage.free)} free, {percent:.0f}% used)"
+                )
+            except Exception as e:
+                lines.append(f"{path}: error checking disk space: {e}")
+        
+        self.disk_info.setPlainText('\n'.join(lines))
     
     def _update_clamav_signatures(self):
         """Update ClamAV virus signatures"""
-        try:
-            QMessageBox.information(
-                self,
-                "Updating",
-                "Updating virus signatures...\nThis may take a few minutes."
-            )
-            
-            result = subprocess.run(
-                ['sudo', 'freshclam'],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode == 0:
-                QMessageBox.information(self, "Success", "Virus signatures updated successfully")
-            else:
-                QMessageBox.warning(self, "Error", f"Update failed:\n{result.stderr}")
+        if self._update_job is not None:
+            self._update_progress.show()
+            return
         
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to update signatures:\n{e}")
+        # Non-modal so the dashboard stays usable; closing it cancels the update
+        self._update_progress = QProgressDialog(
+            "Updating virus signatures...\nThis may take a few minutes.",
+            "Cancel",
+            0,
+            0,
+            self
+        )
+        self._update_progress.setWindowTitle("Updating")
+        self._update_progress.setWindowModality(Qt.WindowModality.NonModal)
+        self._update_progress.setMinimumDuration(0)
+        
+        self._update_job = SubprocessJob(['sudo', 'freshclam'], timeout=300)
+        self._update_job.signals.finished.connect(self._on_signatures_updated)
+        self._update_progress.canceled.connect(self._update_job.cancel)
+        
+        QThreadPool.globalInstance().start(self._update_job)
+        self._update_progress.show()
+    
+    def _on_signatures_updated(self, returncode: int, stdout: str, stderr: str):
+        """
+        Report the result of a finished signature update
+        
+        Args:
+            returncode: freshclam exit code (-1 if it could not run or was cancelled)
+            stdout: freshclam output
+            stderr: freshclam error output
+        """
+        cancelled = self._update_progress.wasCanceled()
+        
+        self._update_job = None
+        DashboardWindow._load_clamav_status.invalidate(self)
+        self._update_progress.close()
+        self._update_progress.deleteLater()
+        self._update_progress = None
+        
+        if cancelled:
+            logger.info("Virus signature update cancelled")
+        elif returncode == 0:
+            QMessageBox.information(self, "Success", "Virus signatures updated successfully")
+        elif returncode < 0:
+            QMessageBox.critical(self, "Error", f"Failed to update signatures:\n{stderr}")
+        else:
+            QMessageBox.warning(self, "Error", f"Update failed:\n{stderr}")
     
     def _restart_clamav(self):
         """Restart ClamAV daemon"""
-        try:
-            result = subprocess.run(
-                ['sudo', 'systemctl', 'restart', 'clamav-daemon'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                QMessageBox.information(self, "Success", "ClamAV restarted successfully")
-                self._load_clamav_status()
-            else:
-                QMessageBox.warning(self, "Error", f"Restart failed:\n{result.stderr}")
+        if self._restart_job is not None:
+            return
         
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to restart ClamAV:\n{e}")
+        self._restart_job = SubprocessJob(['sudo', 'systemctl', 'restart', 'clamav-daemon'], timeout=30)
+        self._restart_job.signals.finished.connect(self._on_clamav_restarted)
+        QThreadPool.globalInstance().start(self._restart_job)
+    
+    def _on_clamav_restarted(self, returncode: int, stdout: str, stderr: str):
+        """
+        Report the result of a finished ClamAV restart
+        
+        Args:
+            returncode: systemctl exit code (-1 if it could not run)
+            stdout: systemctl output
+            stderr: systemctl error output
+        """
+        self._restart_job = None
+        
+        # The daemon state changed (or may have), so don't show a cached status
+        self._load_clamav_status(force=True)
+        
+        if returncode == 0:
+            QMessageBox.information(self, "Success", "ClamAV restarted successfully")
+        elif returncode < 0:
+            QMessageBox.critical(self, "Error", f"Failed to restart ClamAV:\n{stderr}")
+        else:
+            QMessageBox.warning(self, "Error", f"Restart failed:\n{stderr}")
+    
+    def _update_refresh_timer(self):
+        """Start or stop the refresh timer based on window state and current tab"""
+        active = (
+            self.isVisible()
+            and not self.isMinimized()
+            and self.tabs.currentIndex() != 1  # Logs tab is not auto-refreshed
+        )
+        
+        if active and not self.refresh_timer.isActive():
+            self.refresh_timer.start(REFRESH_INTERVAL_MS)
+            self._schedule_refresh()
+        elif not active and self.refresh_timer.isActive():
+            self.refresh_timer.stop()
+    
+    def showEvent(self, event):
+        """Resume auto-refresh when shown"""
+        super().showEvent(event)
+        self._update_refresh_timer()
+    
+    def hideEvent(self, event):
+        """Pause auto-refresh when hidden"""
+        super().hideEvent(event)
+        self._update_refresh_timer()
+    
+    def changeEvent(self, event):
+        """Pause auto-refresh while minimized"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._update_refresh_timer()
     
     def closeEvent(self, event):
         """Handle window close"""
         self.refresh_timer.stop()
+        
+        # Don't leave a signature update running after the dashboard is gone
+        if self._update_job is not None:
+            self._update_job.cancel()
+        
         logger.info("Dashboard closed")
         event.accept()
 
@@ -481,6 +1081,8 @@ def main():
     
     # Create and show dashboard
     dashboard = DashboardWindow(config)
+    if not dashboard.authenticated:
+        sys.exit(0)
     dashboard.show()
     
     sys.exit(app.exec())
@@ -5,29 +5,119 @@ Admin interface for registering secure USB devices
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QTableWidget, QTableWidgetItem, QDialog, QDialogButtonBox,
+    QTableView, QDialog, QDialogButtonBox,
     QFormLayout, QLineEdit, QTextEdit, QMessageBox, QFileDialog,
-    QHeaderView
+    QHeaderView, QProgressDialog
+)
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 )
-from PyQt6.QtCore import Qt, pyqtSignal
 from pathlib import Path
+from datetime import datetime
+from typing import Dict, List
 
 from src.usb.secure_usb_manager import SecureUSBManager, SecureUSBDevice
 from src.usb.device_monitor import USBDevice
-from src.transfer.secure_usb_transfer import SecureUSBTransferManager
+from src.transfer.secure_usb_transfer import SecureUSBTransferManager, clear_udev_cache
 from src.utils.logger import KioskLogger
 
 
 logger = KioskLogger.get_logger(__name__)
 
 
+# Usage log entries fetched per page as the history view scrolls
+HISTORY_PAGE_SIZE = 200
+
+# Current device summary
+_INFO_TMPL = "Device: {dn}\nSerial: {s}\nVendor ID: {v}\nProduct ID: {p}"
+
+# Current device box, one look per registration state; parsed once for the widget
+REGISTRATION_QSS = """
+QLabel#currentDevice { background-color: #f0f0f0; padding: 10px; margin-bottom: 10px; }
+QLabel#currentDevice[state="registered"] { background-color: #C8E6C9; }
+QLabel#currentDevice[state="unregistered"] { background-color: #FFECB3; }
+QLabel#currentDevice[state="noserial"] { background-color: #FFCCBC; }
+"""
+
+# Fixed pixel widths for fixed-format columns; the remaining column stretches
+DEVICE_COLUMN_WIDTHS = {1: 180, 2: 80, 3: 80, 4: 100}
+HISTORY_COLUMN_WIDTHS = {0: 160, 2: 120}
+
+
+def _set_column_widths(table: QTableView, stretch_column: int, widths: Dict[int, int]):
+    """
+    Give a table fixed column widths so Qt never sizes columns from their contents
+    
+    Args:
+        table: Table view with its model set
+        stretch_column: Column that takes the remaining width
+        widths: Pixel width per fixed column
+    """
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(stretch_column, QHeaderView.ResizeMode.Stretch)
+    
+    for column, width in widths.items():
+        header.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+        table.setColumnWidth(column, width)
+
+
+class ImportSignals(QObject):
+    """Signals for ImportRegistrationsJob (QRunnable cannot define signals)"""
+    
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, int)
+
+
+class ImportRegistrationsJob(QRunnable):
+    """Imports registrations from a JSON file off the GUI thread"""
+    
+    def __init__(self, db_path: Path, import_path: Path, merge: bool):
+        super().__init__()
+        self.db_path = db_path
+        self.import_path = import_path
+        self.merge = merge
+        self.signals = ImportSignals()
+    
+    def run(self):
+        """Import and emit (successful, failed)"""
+        # Own manager: its connections and cache stay on this thread, and the
+        # GUI's manager picks up the changes through its database stamp
+        manager = SecureUSBManager(str(self.db_path))
+        successful, failed = manager.import_registrations(
+            self.import_path, self.merge, self.signals.progress.emit
+        )
+        self.signals.finished.emit(successful, failed)
+
+
+class ExportSignals(QObject):
+    """Signals for ExportRegistrationsJob"""
+    
+    finished = pyqtSignal(bool, str)
+
+
+class ExportRegistrationsJob(QRunnable):
+    """Exports registrations to a JSON file off the GUI thread"""
+    
+    def __init__(self, db_path: Path, export_path: Path):
+        super().__init__()
+        self.db_path = db_path
+        self.export_path = export_path
+        self.signals = ExportSignals()
+    
+    def run(self):
+        """Export and emit whether it succeeded, with the export path"""
+        manager = SecureUSBManager(str(self.db_path))
+        ok = manager.export_registrations(self.export_path)
+        self.signals.finished.emit(ok, str(self.export_path))
+
+
 class RegisterUSBDialog(QDialog):
-    """Dialog for registering a new secure USB device"""
+    """Dialog for registering a new secure USB device; reusable via reset()"""
     
     def __init__(self, device_info: dict, parent=None):
         super().__init__(parent)
         
-        self.device_info = device_info
+        self.device_info = {}
         self.device = None
         
         self.setWindowTitle("Register Secure USB")
@@ -46,23 +136,14 @@ class RegisterUSBDialog(QDialog):
         info_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         layout.addWidget(info_label)
         
-        info_text = f"""
-Serial Number: {device_info.get('serial', 'UNKNOWN')}
-Vendor ID: {device_info.get('vendor_id', 'UNKNOWN')}
-Product ID: {device_info.get('product_id', 'UNKNOWN')}
-Device Node: {device_info.get('device_node', 'UNKNOWN')}
-Size: {device_info.get('size', 'UNKNOWN')}
-        """.strip()
-        
-        info_display = QLabel(info_text)
-        info_display.setStyleSheet("background-color: #f0f0f0; padding: 10px; margin-bottom: 10px;")
-        layout.addWidget(info_display)
+        self.info_display = QLabel()
+        self.info_display.setStyleSheet("background-color: #f0f0f0; padding: 10px; margin-bottom: 10px;")
+        layout.addWidget(self.info_display)
         
         # Warning if serial is unknown
-        if device_info.get('serial') == 'UNKNOWN':
-            warning = QLabel("⚠️ Warning: Unable to read serial number. This device may not be reliably identified.")
-            warning.setStyleSheet("color: #FF5722; font-weight: bold;")
-            layout.addWidget(warning)
+        self.serial_warning = QLabel("⚠️ Warning: Unable to read serial number. This device may not be reliably identified.")
+        self.serial_warning.setStyleSheet("color: #FF5722; font-weight: bold;")
+        layout.addWidget(self.serial_warning)
         
         # Registration form
         form = QFormLayout()
@@ -82,12 +163,36 @@ Size: {device_info.get('size', 'UNKNOWN')}
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
         )
-        buttons.accepted.connect(self.accept_registration)
-        buttons.rejected.connect(self.reject)
+        buttons.accepted.connect(self.accept_registration, Qt.ConnectionType.DirectConnection)
+        buttons.rejected.connect(self.reject, Qt.ConnectionType.DirectConnection)
         layout.addWidget(buttons)
         
+        self.reset(device_info)
+    
+    def reset(self, device_info: dict):
+        """
+        Prepare the dialog for registering another device
+        
+        Args:
+            device_info: Device info from get_device_info_for_registration
+        """
+        self.device_info = device_info
+        self.device = None
+        
+        self.info_display.setText(f"""
+Serial Number: {device_info.get('serial', 'UNKNOWN')}
+Vendor ID: {device_info.get('vendor_id', 'UNKNOWN')}
+Product ID: {device_info.get('product_id', 'UNKNOWN')}
+Device Node: {device_info.get('device_node', 'UNKNOWN')}
+Size: {device_info.get('size', 'UNKNOWN')}
+        """.strip())
+        self.serial_warning.setVisible(device_info.get('serial') == 'UNKNOWN')
+        
+        self.label_field.clear()
+        self.notes_field.clear()
         self.label_field.setFocus()
     
+    @pyqtSlot()
     def accept_registration(self):
         """Validate and accept registration"""
         label = self.label_field.text().strip()
@@ -118,6 +223,131 @@ Size: {device_info.get('size', 'UNKNOWN')}
         self.accept()
 
 
+class SecureUSBTableModel(QAbstractTableModel):
+    """Table model over registered secure USB devices"""
+    
+    HEADERS = ["Label", "Serial", "Vendor ID", "Product ID", "Registered Date"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        self._devices: List[SecureUSBDevice] = []
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._devices)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        
+        device = self._devices[index.row()]
+        column = index.column()
+        
+        if column == 0:
+            return device.label
+        elif column == 1:
+            return device.serial
+        elif column == 2:
+            return device.vendor_id
+        elif column == 3:
+            return device.product_id
+        else:
+            return device.registered_date[:10]  # Date only
+    
+    def set_devices(self, devices: List[SecureUSBDevice]):
+        """
+        Replace all devices
+        
+        Args:
+            devices: Registered devices
+        """
+        self.beginResetModel()
+        self._devices = devices
+        self.endResetModel()
+    
+    def device_at(self, row: int) -> SecureUSBDevice:
+        """
+        Get the device shown in a row
+        
+        Args:
+            row: Table row
+            
+        Returns:
+            SecureUSBDevice for the row
+        """
+        return self._devices[row]
+
+
+class UsageHistoryModel(QAbstractTableModel):
+    """Table model over a secure USB device's usage log, fetched a page at a time"""
+    
+    HEADERS = ["Timestamp", "Session ID", "Files Transferred"]
+    
+    def __init__(self, usb_manager: SecureUSBManager, serial: str, total: int, parent=None):
+        super().__init__(parent)
+        
+        self._usb_manager = usb_manager
+        self._serial = serial
+        self._total = total
+        self._history: List[Dict] = []
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and len(self._history) < self._total
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        
+        page = self._usb_manager.get_usage_history(
+            self._serial,
+            limit=HISTORY_PAGE_SIZE,
+            offset=len(self._history)
+        )
+        
+        if not page:
+            # Entries were removed since counting; stop asking for more
+            self._total = len(self._history)
+            return
+        
+        first = len(self._history)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._history.extend(page)
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._history)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        
+        entry = self._history[index.row()]
+        column = index.column()
+        
+        if column == 0:
+            return entry['timestamp'][:19]
+        elif column == 1:
+            return entry['session_id']
+        else:
+            return str(entry['file_count'])
+
+
 class USBRegistrationWidget(QWidget):
     """Widget for managing secure USB registration"""
     
@@ -135,6 +365,19 @@ class USBRegistrationWidget(QWidget):
         
         self.current_device: USBDevice = None
         
+        # Registration info for current_device (udev lookups), and the last rendered display
+        self._device_info = None
+        self._device_info_for = None
+        self._shown_display = None
+        
+        self._register_dialog = None
+        
+        # Import/export job in flight and its progress dialog
+        self._io_job = None
+        self._io_progress = None
+        
+        self.setStyleSheet(REGISTRATION_QSS)
+        
         self._init_ui()
         self._load_registered_devices()
     
@@ -162,19 +405,20 @@ class USBRegistrationWidget(QWidget):
         layout.addWidget(current_device_label)
         
         self.current_device_info = QLabel("No USB device detected")
-        self.current_device_info.setStyleSheet("background-color: #f0f0f0; padding: 10px; margin-bottom: 10px;")
+        self.current_device_info.setObjectName("currentDevice")
+        self.current_device_info.setProperty("state", "none")
         layout.addWidget(self.current_device_info)
         
         # Buttons for current device
         current_buttons = QHBoxLayout()
         
         self.register_current_btn = QPushButton("Register Current USB")
-        self.register_current_btn.clicked.connect(self.register_current_device)
+        self.register_current_btn.clicked.connect(self.register_current_device, Qt.ConnectionType.DirectConnection)
         self.register_current_btn.setEnabled(False)
         current_buttons.addWidget(self.register_current_btn)
         
         self.refresh_device_btn = QPushButton("Refresh")
-        self.refresh_device_btn.clicked.connect(self.refresh_current_device)
+        self.refresh_device_btn.clicked.connect(self.refresh_current_device, Qt.ConnectionType.DirectConnection)
         current_buttons.addWidget(self.refresh_device_btn)
         
         current_buttons.addStretch()
@@ -187,11 +431,11 @@ class USBRegistrationWidget(QWidget):
         layout.addWidget(registered_label)
         
         # Table
-        self.devices_table = QTableWidget()
-        self.devices_table.setColumnCount(5)
-        self.devices_table.setHorizontalHeaderLabels(["Label", "Serial", "Vendor ID", "Product ID", "Registered Date"])
-        self.devices_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.devices_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self._model = SecureUSBTableModel(self)
+        self.devices_table = QTableView()
+        self.devices_table.setModel(self._model)
+        _set_column_widths(self.devices_table, 0, DEVICE_COLUMN_WIDTHS)
+        self.devices_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         layout.addWidget(self.devices_table)
         
         # Device count
@@ -203,25 +447,26 @@ class USBRegistrationWidget(QWidget):
         table_buttons = QHBoxLayout()
         
         self.unregister_btn = QPushButton("Unregister Selected")
-        self.unregister_btn.clicked.connect(self.unregister_selected)
+        self.unregister_btn.clicked.connect(self.unregister_selected, Qt.ConnectionType.DirectConnection)
         table_buttons.addWidget(self.unregister_btn)
         
         self.view_usage_btn = QPushButton("View Usage History")
-        self.view_usage_btn.clicked.connect(self.view_usage_history)
+        self.view_usage_btn.clicked.connect(self.view_usage_history, Qt.ConnectionType.DirectConnection)
         table_buttons.addWidget(self.view_usage_btn)
         
         table_buttons.addStretch()
         
         self.export_btn = QPushButton("Export")
-        self.export_btn.clicked.connect(self.export_registrations)
+        self.export_btn.clicked.connect(self.export_registrations, Qt.ConnectionType.DirectConnection)
         table_buttons.addWidget(self.export_btn)
         
         self.import_btn = QPushButton("Import")
-        self.import_btn.clicked.connect(self.import_registrations)
+        self.import_btn.clicked.connect(self.import_registrations, Qt.ConnectionType.DirectConnection)
         table_buttons.addWidget(self.import_btn)
         
         layout.addLayout(table_buttons)
     
+    @pyqtSlot(object)
     def set_current_device(self, device: USBDevice):
         """
         Set current USB device
@@ -232,49 +477,91 @@ class USBRegistrationWidget(QWidget):
         self.current_device = device
         self.update_current_device_display()
     
+    def _current_device_info(self) -> dict:
+        """
+        Get registration info for the current device, queried once per device
+        
+        Returns:
+            Device info dictionary
+        """
+        if self._device_info_for is not self.current_device:
+            self._device_info = self.transfer_manager.get_device_info_for_registration(self.current_device)
+            self._device_info_for = self.current_device
+        return self._device_info
+    
     def update_current_device_display(self):
         """Update display of current device"""
         if not self.current_device:
+            self._shown_display = None
+            self._set_device_state("none")
             self.current_device_info.setText("No USB device detected")
             self.register_current_btn.setEnabled(False)
             return
         
         # Get device info
-        device_info = self.transfer_manager.get_device_info_for_registration(self.current_device)
+        device_info = self._current_device_info()
         
-        info_text = f"""
-Device: {self.current_device.get_display_name()}
-Serial: {device_info.get('serial', 'UNKNOWN')}
-Vendor ID: {device_info.get('vendor_id', 'UNKNOWN')}
-Product ID: {device_info.get('product_id', 'UNKNOWN')}
-        """.strip()
+        info_text = _INFO_TMPL.format(
+            dn=self.current_device.get_display_name(),
+            s=device_info.get('serial', 'UNKNOWN'),
+            v=device_info.get('vendor_id', 'UNKNOWN'),
+            p=device_info.get('product_id', 'UNKNOWN')
+        )
         
         # Check if already registered
         serial = device_info.get('serial')
         if serial and serial != 'UNKNOWN':
-            if self.usb_manager.is_registered(serial):
-                registered_device = self.usb_manager.get_registered_device(serial)
+            registered_device = self.usb_manager.get_registered_device(serial)
+            if registered_device is not None:
                 info_text += f"\n\n✓ Already registered as: {registered_device.label}"
-                self.current_device_info.setStyleSheet("background-color: #C8E6C9; padding: 10px; margin-bottom: 10px;")
-                self.register_current_btn.setEnabled(False)
+                state = "registered"
+                can_register = False
             else:
                 info_text += "\n\n✗ Not registered"
-                self.current_device_info.setStyleSheet("background-color: #FFECB3; padding: 10px; margin-bottom: 10px;")
-                self.register_current_btn.setEnabled(True)
+                state = "unregistered"
+                can_register = True
         else:
             info_text += "\n\n⚠️ Warning: No serial number detected"
-            self.current_device_info.setStyleSheet("background-color: #FFCCBC; padding: 10px; margin-bottom: 10px;")
-            self.register_current_btn.setEnabled(True)
+            state = "noserial"
+            can_register = True
+        
+        # Nothing to redo if the same device is shown in the same state
+        display = (info_text, state, can_register)
+        if display == self._shown_display:
+            return
+        self._shown_display = display
         
+        self._set_device_state(state)
+        self.register_current_btn.setEnabled(can_register)
         self.current_device_info.setText(info_text)
     
+    def _set_device_state(self, state: str):
+        """
+        Switch the current device box to another REGISTRATION_QSS state
+        
+        Args:
+            state: none, registered, unregistered or noserial
+        """
+        label = self.current_device_info
+        if label.property("state") == state:
+            return
+        label.setProperty("state", state)
+        # Property selectors are only re-evaluated on polish
+        label.style().unpolish(label)
+        label.style().polish(label)
+    
+    @pyqtSlot()
     def refresh_current_device(self):
         """Refresh current device information"""
         if self.current_device:
+            # Explicit refresh: query the device again
+            clear_udev_cache()
+            self._device_info_for = None
             self.update_current_device_display()
         else:
             QMessageBox.information(self, "No Device", "No USB device currently connected.\n\nInsert a USB device and try again.")
     
+    @pyqtSlot()
     def register_current_device(self):
         """Register the current USB device"""
         if not self.current_device:
@@ -282,10 +569,14 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
             return
         
         # Get device info
-        device_info = self.transfer_manager.get_device_info_for_registration(self.current_device)
+        device_info = self._current_device_info()
         
-        # Show registration dialog
-        dialog = RegisterUSBDialog(device_info, self)
+        # Show registration dialog, built on first use and reused after that
+        if self._register_dialog is None:
+            self._register_dialog = RegisterUSBDialog(device_info, self)
+        else:
+            self._register_dialog.reset(device_info)
+        dialog = self._register_dialog
         if dialog.exec() == QDialog.DialogCode.Accepted and dialog.device:
             # Register device
             if self.usb_manager.register_usb(dialog.device):
@@ -308,17 +599,11 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
         """Load registered devices into table"""
         devices = self.usb_manager.get_all_registered()
         
-        self.devices_table.setRowCount(len(devices))
-        
-        for i, device in enumerate(devices):
-            self.devices_table.setItem(i, 0, QTableWidgetItem(device.label))
-            self.devices_table.setItem(i, 1, QTableWidgetItem(device.serial))
-            self.devices_table.setItem(i, 2, QTableWidgetItem(device.vendor_id))
-            self.devices_table.setItem(i, 3, QTableWidgetItem(device.product_id))
-            self.devices_table.setItem(i, 4, QTableWidgetItem(device.registered_date[:10]))  # Date only
+        self._model.set_devices(devices)
         
         self.device_count_label.setText(f"Total: {len(devices)} registered device(s)")
     
+    @pyqtSlot()
     def unregister_selected(self):
         """Unregister selected device"""
         selected_rows = self.devices_table.selectionModel().selectedRows()
@@ -327,9 +612,8 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
             QMessageBox.warning(self, "No Selection", "Please select a device to unregister.")
             return
         
-        row = selected_rows[0].row()
-        label = self.devices_table.item(row, 0).text()
-        serial = self.devices_table.item(row, 1).text()
+        device = self._model.device_at(selected_rows[0].row())
+        label, serial = device.label, device.serial
         
         reply = QMessageBox.question(
             self,
@@ -347,6 +631,7 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
             else:
                 QMessageBox.critical(self, "Error", "Failed to unregister device.")
     
+    @pyqtSlot()
     def view_usage_history(self):
         """View usage history for selected device"""
         selected_rows = self.devices_table.selectionModel().selectedRows()
@@ -355,13 +640,12 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
             QMessageBox.warning(self, "No Selection", "Please select a device to view usage history.")
             return
         
-        row = selected_rows[0].row()
-        label = self.devices_table.item(row, 0).text()
-        serial = self.devices_table.item(row, 1).text()
+        device = self._model.device_at(selected_rows[0].row())
+        label, serial = device.label, device.serial
         
-        history = self.usb_manager.get_usage_history(serial, limit=100)
+        total = self.usb_manager.get_usage_count(serial)
         
-        if not history:
+        if not total:
             QMessageBox.information(self, "No History", f"No usage history for '{label}'.")
             return
         
@@ -372,49 +656,78 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
         
         layout = QVBoxLayout(dialog)
         
-        table = QTableWidget()
-        table.setColumnCount(3)
-        table.setHorizontalHeaderLabels(["Timestamp", "Session ID", "Files Transferred"])
-        table.setRowCount(len(history))
-        
-        for i, entry in enumerate(history):
-            table.setItem(i, 0, QTableWidgetItem(entry['timestamp'][:19]))
-            table.setItem(i, 1, QTableWidgetItem(entry['session_id']))
-            table.setItem(i, 2, QTableWidgetItem(str(entry['file_count'])))
-        
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        table = QTableView()
+        # Rows are fetched from the database as the view scrolls
+        table.setModel(UsageHistoryModel(self.usb_manager, serial, total, table))
+        _set_column_widths(table, 1, HISTORY_COLUMN_WIDTHS)
         layout.addWidget(table)
         
         close_btn = QPushButton("Close")
-        close_btn.clicked.connect(dialog.accept)
+        close_btn.clicked.connect(dialog.accept, Qt.ConnectionType.DirectConnection)
         layout.addWidget(close_btn)
         
         dialog.exec()
     
+    def _open_file_dialog(self, title: str, accept_mode, callback, default_name: str = ""):
+        """
+        Open a JSON file dialog without blocking the event loop
+        
+        Args:
+            title: Dialog title
+            accept_mode: QFileDialog.AcceptMode
+            callback: Slot called with the chosen file path
+            default_name: File name preselected in the dialog
+        """
+        dialog = QFileDialog(self, title)
+        dialog.setAcceptMode(accept_mode)
+        dialog.setNameFilter("JSON Files (*.json)")
+        if accept_mode == QFileDialog.AcceptMode.AcceptOpen:
+            dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        if default_name:
+            dialog.selectFile(default_name)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.fileSelected.connect(callback, Qt.ConnectionType.DirectConnection)
+        dialog.open()
+    
+    @pyqtSlot()
     def export_registrations(self):
         """Export registrations to file"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self,
+        self._open_file_dialog(
             "Export Registrations",
-            f"secure_usb_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            "JSON Files (*.json)"
+            QFileDialog.AcceptMode.AcceptSave,
+            self._on_export_path_chosen,
+            f"secure_usb_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         )
-        
+    
+    @pyqtSlot(str)
+    def _on_export_path_chosen(self, file_path: str):
+        """Export registrations to the file chosen in the dialog"""
         if file_path:
-            if self.usb_manager.export_registrations(Path(file_path)):
-                QMessageBox.information(self, "Success", f"Registrations exported to:\n{file_path}")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to export registrations.")
+            job = ExportRegistrationsJob(self.usb_manager.db_path, Path(file_path))
+            job.signals.finished.connect(self._on_export_finished, Qt.ConnectionType.QueuedConnection)
+            self._start_io_job(job, "Exporting registrations...")
     
+    @pyqtSlot(bool, str)
+    def _on_export_finished(self, ok: bool, file_path: str):
+        """Report the result of an export job"""
+        self._finish_io_job()
+        if ok:
+            QMessageBox.information(self, "Success", f"Registrations exported to:\n{file_path}")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to export registrations.")
+    
+    @pyqtSlot()
     def import_registrations(self):
         """Import registrations from file"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
+        self._open_file_dialog(
             "Import Registrations",
-            "",
-            "JSON Files (*.json)"
+            QFileDialog.AcceptMode.AcceptOpen,
+            self._on_import_path_chosen
         )
-        
+    
+    @pyqtSlot(str)
+    def _on_import_path_chosen(self, file_path: str):
+        """Import registrations from the file chosen in the dialog"""
         if file_path:
             reply = QMessageBox.question(
                 self,
@@ -430,17 +743,69 @@ Product ID: {device_info.get('product_id', 'UNKNOWN')}
             
             merge = (reply == QMessageBox.StandardButton.Yes)
             
-            successful, failed = self.usb_manager.import_registrations(Path(file_path), merge)
-            
-            if successful > 0:
-                QMessageBox.information(
-                    self,
-                    "Import Complete",
-                    f"Successfully imported {successful} device(s).\n"
-                    f"Failed: {failed}"
-                )
-                self._load_registered_devices()
-                self.registrations_changed.emit()
-            else:
-                QMessageBox.critical(self, "Error", f"Import failed. No devices imported.")
+            job = ImportRegistrationsJob(self.usb_manager.db_path, Path(file_path), merge)
+            job.signals.progress.connect(self._on_import_progress, Qt.ConnectionType.QueuedConnection)
+            job.signals.finished.connect(self._on_import_finished, Qt.ConnectionType.QueuedConnection)
+            self._start_io_job(job, "Importing registrations...")
+    
+    @pyqtSlot(int, int)
+    def _on_import_progress(self, processed: int, total: int):
+        """Update the progress dialog during an import"""
+        if self._io_progress:
+            self._io_progress.setMaximum(total)
+            self._io_progress.setValue(processed)
+    
+    @pyqtSlot(int, int)
+    def _on_import_finished(self, successful: int, failed: int):
+        """Report the result of an import job and reload the table"""
+        self._finish_io_job()
+        # The job wrote through its own manager: never trust cached registrations
+        self.usb_manager.invalidate_cache()
+        self.transfer_manager.usb_manager.invalidate_cache()
+        if successful > 0:
+            QMessageBox.information(
+                self,
+                "Import Complete",
+                f"Successfully imported {successful} device(s).\n"
+                f"Failed: {failed}"
+            )
+            self._load_registered_devices()
+            self.update_current_device_display()
+            self.registrations_changed.emit()
+        else:
+            QMessageBox.critical(self, "Error", f"Import failed. No devices imported.")
+    
+    def _start_io_job(self, job: QRunnable, message: str):
+        """
+        Run an import/export job on the thread pool behind a progress dialog
+        
+        Job signals are emitted from the pool thread and must be connected
+        with QueuedConnection; everything else here lives on the GUI thread.
+        
+        Args:
+            job: Job to start
+            message: Progress dialog text
+        """
+        self.export_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        
+        self._io_progress = QProgressDialog(message, None, 0, 0, self)
+        self._io_progress.setWindowTitle("Please Wait")
+        self._io_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._io_progress.setMinimumDuration(0)
+        self._io_progress.show()
+        
+        self._io_job = job
+        QThreadPool.globalInstance().start(job)
+    
+    def _finish_io_job(self):
+        """Tear down the progress dialog of a finished import/export job"""
+        self._io_job = None
+        if self._io_progress:
+            self._io_progress.close()
+            self._io_progress.deleteLater()
+            self._io_progress = None
+        
+        self.export_btn.setEnabled(True)
+        self.import_btn.setEnabled(True)
 
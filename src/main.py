@@ -4,9 +4,9 @@ USB Defender Kiosk - Main Entry Point
 Secure file transfer from untrusted USB devices
 """
 
+import os
 import sys
 import signal
-from pathlib import Path
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt
 
@@ -46,16 +46,17 @@ def check_requirements():
     ]
     
     for dir_path in required_dirs:
-        path = Path(dir_path)
-        if not path.exists():
+        try:
+            os.stat(dir_path)
+        except FileNotFoundError:
+            # Only missing directories pay for the component-by-component walk
             try:
-                path.mkdir(parents=True, exist_ok=True)
+                os.makedirs(dir_path, mode=0o755, exist_ok=True)
             except PermissionError:
                 errors.append(f"Cannot create directory: {dir_path} (permission denied)")
     
     # Check if ClamAV socket exists
-    clamav_socket = Path('/var/run/clamav/clamd.ctl')
-    if not clamav_socket.exists():
+    if not os.path.exists('/var/run/clamav/clamd.ctl'):
         # This is a warning, not a hard error
         logger.warning("ClamAV socket not found - antivirus scanning will be disabled")
     
@@ -135,12 +136,15 @@ def main():
     app.setApplicationName("USB Defender Kiosk")
     app.setOrganizationName("USB Defender")
     
-    # Set application-wide style
+    # Set application-wide style; needs the QApplication, and is set before
+    # any window exists so no widget has to be repolished
     app.setStyle('Fusion')
     
-    # Disable screen blanking (if possible)
-    if hasattr(Qt, 'AA_DisableWindowContextHelpButton'):
+    # Hide the "?" button in dialog title bars (Qt 5 only; Qt 6 never shows it)
+    try:
         app.setAttribute(Qt.ApplicationAttribute.AA_DisableWindowContextHelpButton)
+    except AttributeError:
+        pass
     
     try:
         # Create and show main window
@@ -4,8 +4,11 @@ Integrates ClamAV antivirus for file scanning
 """
 
 import clamd
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import BinaryIO, Callable, Tuple, Optional
 from enum import Enum
 from src.utils.logger import KioskLogger
 
@@ -13,6 +16,11 @@ from src.utils.logger import KioskLogger
 logger = KioskLogger.get_logger(__name__)
 
 
+# Seconds a successful ping counts as "available", and a stats() reply is reused
+PING_TTL = 5
+STATS_TTL = 60
+
+
 class ScanResult(Enum):
     """Scan result enumeration"""
     CLEAN = "clean"
@@ -34,8 +42,20 @@ class ClamAVScanner:
         self.config = config
         self.socket_path = config.get('socket', '/var/run/clamav/clamd.ctl')
         self.timeout = config.get('timeout', 300)
+        # Files up to this size are streamed to clamd; larger ones are scanned by path
+        self.stream_max_bytes = config.get('stream_max_mb', 25) * 1024 * 1024
+        # Concurrent scans in scan_multiple_files (clamd scans with its own thread pool)
+        self.scan_workers = config.get('scan_workers', 8)
         self.cd: Optional[clamd.ClamdUnixSocket] = None
         
+        # Per-thread clients: a clamd client keeps its socket on the object
+        self._local = threading.local()
+        
+        # time.monotonic() of the last successful ping; cached stats() reply
+        self._ping_ts = None
+        self._stats_cache = None
+        self._stats_ts = 0.0
+        
         self._connect()
     
     def _connect(self):
@@ -45,17 +65,31 @@ class ClamAVScanner:
             
             # Test connection
             self.cd.ping()
-            logger.info(f"Connected to ClamAV daemon at {self.socket_path}")
+            self._ping_ts = time.monotonic()
+            logger.info("Connected to ClamAV daemon at %s", self.socket_path)
             
             # Log ClamAV version
             version = self.cd.version()
-            logger.info(f"ClamAV version: {version}")
+            logger.info("ClamAV version: %s", version)
             
         except Exception as e:
-            logger.error(f"Failed to connect to ClamAV daemon: {e}")
-            logger.error(f"Make sure ClamAV is running: systemctl status clamav-daemon")
+            logger.error("Failed to connect to ClamAV daemon: %s", e)
+            logger.error("Make sure ClamAV is running: systemctl status clamav-daemon")
             self.cd = None
     
+    def _client(self) -> clamd.ClamdUnixSocket:
+        """
+        Get the calling thread's clamd client
+        
+        Returns:
+            ClamdUnixSocket for this thread
+        """
+        client = getattr(self._local, 'cd', None)
+        if client is None:
+            client = clamd.ClamdUnixSocket(path=self.socket_path)
+            self._local.cd = client
+        return client
+    
     def is_available(self) -> bool:
         """
         Check if ClamAV is available
@@ -66,10 +100,15 @@ class ClamAVScanner:
         if not self.cd:
             return False
         
+        if self._ping_ts is not None and time.monotonic() - self._ping_ts < PING_TTL:
+            return True
+        
         try:
             self.cd.ping()
+            self._ping_ts = time.monotonic()
             return True
         except Exception:
+            self._ping_ts = None
             return False
     
     def scan_file(self, file_path: Path) -> Tuple[ScanResult, str]:
@@ -87,71 +126,135 @@ class ClamAVScanner:
             return ScanResult.ERROR, "ClamAV not available"
         
         if not file_path.exists():
-            logger.error(f"File not found: {file_path}")
+            logger.error("File not found: %s", file_path)
             return ScanResult.ERROR, "File not found"
         
         try:
-            logger.info(f"Scanning file: {file_path}")
+            # Streaming means clamd never needs read access to our files
+            if file_path.stat().st_size <= self.stream_max_bytes:
+                with open(file_path, 'rb') as f:
+                    return self.scan_stream(f, str(file_path))
+        except OSError as e:
+            logger.error("Error opening file for scanning: %s", e)
+            return ScanResult.ERROR, f"Scan error: {str(e)}"
+        
+        # Too large for INSTREAM (StreamMaxLength); let clamd read it from disk
+        return self._run_scan(str(file_path), str(file_path), lambda: self._client().scan(str(file_path)))
+    
+    def scan_stream(self, fobj: BinaryIO, name: str = "stream") -> Tuple[ScanResult, str]:
+        """
+        Scan data from a binary file object by streaming it to clamd (INSTREAM)
+        
+        Args:
+            fobj: Readable binary file object, e.g. an open file or BytesIO
+            name: Name used in log and audit messages
+            
+        Returns:
+            Tuple of (ScanResult, details_message)
+        """
+        if not self.cd:
+            logger.error("ClamAV not available")
+            return ScanResult.ERROR, "ClamAV not available"
+        
+        # clamd reports stream results under the name "stream"
+        return self._run_scan(name, 'stream', lambda: self._client().instream(fobj))
+    
+    def _run_scan(self, name: str, result_key: str, scan: Callable[[], Optional[dict]]) -> Tuple[ScanResult, str]:
+        """
+        Run a clamd scan call and interpret its result
+        
+        Args:
+            name: File name for log and audit messages
+            result_key: Key clamd uses for this file in the result dict
+            scan: Performs the clamd request
+            
+        Returns:
+            Tuple of (ScanResult, details_message)
+        """
+        try:
+            logger.info("Scanning file: %s", name)
             
             # Scan the file
-            result = self.cd.scan(str(file_path))
+            result = scan()
             
             # Parse result
             if result is None:
                 # No threats found
-                logger.info(f"File is clean: {file_path}")
-                KioskLogger.audit_file_scan(str(file_path), "CLEAN")
+                logger.info("File is clean: %s", name)
+                KioskLogger.audit_file_scan(name, "CLEAN")
                 return ScanResult.CLEAN, "No threats detected"
             
             # result is a dict: {filename: ('FOUND', 'threat_name')}
-            file_key = str(file_path)
-            if file_key in result:
-                status, threat_name = result[file_key]
+            if result_key in result:
+                status, threat_name = result[result_key]
                 
                 if status == 'FOUND':
-                    logger.warning(f"Threat detected in {file_path}: {threat_name}")
+                    logger.warning("Threat detected in %s: %s", name, threat_name)
                     KioskLogger.audit_file_scan(
-                        str(file_path),
+                        name,
                         "INFECTED",
                         threat_name
                     )
                     return ScanResult.INFECTED, f"Threat detected: {threat_name}"
                 elif status == 'ERROR':
-                    logger.error(f"Error scanning {file_path}")
-                    KioskLogger.audit_file_scan(str(file_path), "ERROR")
+                    logger.error("Error scanning %s", name)
+                    KioskLogger.audit_file_scan(name, "ERROR")
                     return ScanResult.ERROR, "Scan error"
             
             # Shouldn't reach here, but treat as clean
             return ScanResult.CLEAN, "No threats detected"
         
         except clamd.BufferTooLongError:
-            logger.error(f"File too large to scan: {file_path}")
+            logger.error("File too large to scan: %s", name)
             return ScanResult.ERROR, "File too large for scanning"
         
         except clamd.ConnectionError:
             logger.error("Lost connection to ClamAV daemon")
-            self._connect()  # Try to reconnect
+            self._ping_ts = None
+            # Replace only this thread's client; health checks (ping/version) are
+            # left to is_available so the next scan costs a single connect
+            self._local.cd = None
             return ScanResult.ERROR, "Connection to antivirus lost"
         
         except Exception as e:
-            logger.error(f"Error scanning file: {e}", exc_info=True)
+            logger.error("Error scanning file: %s", e, exc_info=True)
             return ScanResult.ERROR, f"Scan error: {str(e)}"
     
-    def scan_multiple_files(self, file_paths: list) -> dict:
+    def scan_multiple_files(self, file_paths: list,
+                            progress_callback: Optional[Callable[[str], None]] = None) -> dict:
         """
-        Scan multiple files
+        Scan multiple files concurrently
         
         Args:
-            file_paths: List of file paths to scan
+            file_paths: List of file paths to scan, or an iterable that yields
+                them as they become available; each file is submitted for
+                scanning as soon as it is yielded
+            progress_callback: Called with each file path as its scan completes
             
         Returns:
             Dictionary mapping file paths to (ScanResult, details) tuples
         """
         results = {}
         
-        for file_path in file_paths:
-            result, details = self.scan_file(Path(file_path))
-            results[str(file_path)] = (result, details)
+        if isinstance(file_paths, (list, tuple)):
+            if not file_paths:
+                return results
+            workers = max(1, min(self.scan_workers, len(file_paths)))
+        else:
+            workers = max(1, self.scan_workers)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.scan_file, Path(file_path)): str(file_path)
+                for file_path in file_paths
+            }
+            
+            for future in as_completed(futures):
+                file_path = futures[future]
+                results[file_path] = future.result()
+                
+                if progress_callback:
+                    progress_callback(file_path)
         
         return results
     
@@ -179,11 +282,11 @@ class ClamAVScanner:
                 logger.info("Freshclam update triggered")
                 return True
             else:
-                logger.error(f"Failed to trigger update: {result.stderr}")
+                logger.error("Failed to trigger update: %s", result.stderr)
                 return False
         
         except Exception as e:
-            logger.error(f"Error triggering signature update: {e}")
+            logger.error("Error triggering signature update: %s", e)
             return False
     
     def get_signature_info(self) -> Optional[str]:
@@ -196,10 +299,16 @@ class ClamAVScanner:
         if not self.cd:
             return None
         
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_ts < STATS_TTL:
+            return self._stats_cache
+        
         try:
             stats = self.cd.stats()
+            self._stats_cache = stats
+            self._stats_ts = now
             return stats
         except Exception as e:
-            logger.error(f"Error getting signature info: {e}")
+            logger.error("Error getting signature info: %s", e)
             return None
 
@@ -3,20 +3,46 @@ USB Defender Kiosk - File Validator
 Validates file types and checks file properties
 """
 
+import os
+import stat
 import magic
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, Iterator, Tuple, Optional
 from src.utils.logger import KioskLogger
 
 
 logger = KioskLogger.get_logger(__name__)
 
+# Expected MIME type prefix for each extension, used for the mismatch check
+_MIME_MAP = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats',
+    'xls': 'application/vnd.ms-excel',
+    'xlsx': 'application/vnd.openxmlformats',
+    'ppt': 'application/vnd.ms-powerpoint',
+    'pptx': 'application/vnd.openxmlformats',
+    'odt': 'application/vnd.oasis',
+    'ods': 'application/vnd.oasis',
+    'odp': 'application/vnd.oasis',
+    'txt': 'text/',
+    'rtf': 'application/rtf',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp',
+    'tiff': 'image/tiff',
+}
+
 
 class FileValidator:
     """Validates file types and properties"""
     
     # Known dangerous MIME types
-    DANGEROUS_MIME_TYPES = {
+    DANGEROUS_MIME_TYPES = frozenset({
         'application/x-executable',
         'application/x-sharedlib',
         'application/x-mach-binary',
@@ -31,7 +57,22 @@ class FileValidator:
         'text/x-python',
         'application/x-perl',
         'application/x-ruby',
-    }
+    })
+    
+    # Signatures of common formats that are trusted without libmagic when the
+    # extension agrees: (header prefix, MIME type, extensions)
+    _FAST_SIGS = (
+        (b'%PDF-', 'application/pdf', {'pdf'}),
+        (b'\x89PNG\r\n\x1a\n', 'image/png', {'png'}),
+        (b'\xff\xd8\xff', 'image/jpeg', {'jpg', 'jpeg'}),
+        (b'GIF87a', 'image/gif', {'gif'}),
+        (b'GIF89a', 'image/gif', {'gif'}),
+        (b'II*\x00', 'image/tiff', {'tiff'}),
+        (b'MM\x00*', 'image/tiff', {'tiff'}),
+        (b'{\\rtf', 'application/rtf', {'rtf'}),
+        (b'PK\x03\x04', 'application/zip', {'docx', 'xlsx', 'pptx', 'odt', 'ods', 'odp'}),
+        (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/x-ole-storage', {'doc', 'xls', 'ppt'}),
+    )
     
     def __init__(self, config: dict):
         """
@@ -42,48 +83,96 @@ class FileValidator:
         """
         self.config = config
         self.max_file_size = config.get('max_size_mb', 100) * 1024 * 1024
-        self.allowed_extensions = set(ext.lower() for ext in config.get('allowed_extensions', []))
-        self.blocked_extensions = set(ext.lower() for ext in config.get('blocked_extensions', []))
+        self.allowed_extensions = frozenset(ext.lower().lstrip('.') for ext in config.get('allowed_extensions', []))
+        self.blocked_extensions = frozenset(ext.lower().lstrip('.') for ext in config.get('blocked_extensions', []))
+        # Files validated concurrently in validate_multiple_files
+        self.validation_workers = config.get('validation_workers', 8)
+        # Bytes read from the start of a file for MIME detection
+        self.magic_header_bytes = config.get('magic_header_bytes', 4096)
+        
+        # Per-thread Magic instances: each one serializes its calls with a lock
+        self._local = threading.local()
         
         # Initialize python-magic
         try:
             self.magic = magic.Magic(mime=True)
+            self._local.magic = self.magic
             logger.info("File validator initialized with python-magic")
         except Exception as e:
             logger.error(f"Failed to initialize python-magic: {e}")
             self.magic = None
     
-    def validate_file(self, file_path: Path) -> Tuple[bool, str]:
+    def _magic(self) -> magic.Magic:
         """
-        Validate a file
+        Get the calling thread's Magic instance
         
-        Args:
-            file_path: Path to file to validate
-            
         Returns:
-            Tuple of (is_valid, reason)
+            magic.Magic for this thread
         """
-        if not file_path.exists():
-            return False, "File does not exist"
+        detector = getattr(self._local, 'magic', None)
+        if detector is None:
+            detector = magic.Magic(mime=True)
+            self._local.magic = detector
+        return detector
+    
+    def _read_header(self, file_path: Path) -> bytes:
+        """
+        Read the first magic_header_bytes bytes of a file
         
-        if not file_path.is_file():
-            return False, "Not a regular file"
+        Uses a raw descriptor: a buffered file object would fstat the file and
+        fill its own buffer before handing back a copy.
         
-        # Check file size
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            File header
+        """
+        fd = os.open(file_path, os.O_RDONLY)
         try:
-            file_size = file_path.stat().st_size
-            if file_size == 0:
-                return False, "File is empty"
+            return os.read(fd, self.magic_header_bytes)
+        finally:
+            os.close(fd)
+    
+    def _detect_mime(self, file_path: Path) -> str:
+        """
+        Detect a file's MIME type from its header with libmagic
+        
+        Args:
+            file_path: Path to file
             
-            if file_size > self.max_file_size:
-                max_mb = self.max_file_size / (1024 * 1024)
-                return False, f"File too large (max {max_mb:.0f} MB)"
+        Returns:
+            MIME type string
+        """
+        return self._magic().from_buffer(self._read_header(file_path))
+    
+    def _fast_mime(self, header: bytes, extension: str) -> Optional[str]:
+        """
+        Match a header against the common format signatures
         
-        except Exception as e:
-            logger.error(f"Error checking file size: {e}")
-            return False, "Cannot read file"
+        Args:
+            header: File header
+            extension: File extension (without dot)
+            
+        Returns:
+            MIME type if a signature matches and agrees with the extension, else None
+        """
+        for prefix, mime_type, extensions in self._FAST_SIGS:
+            if header.startswith(prefix) and extension in extensions:
+                return mime_type
+        return None
+    
+    def validate_file(self, file_path: Path) -> Tuple[bool, str]:
+        """
+        Validate a file
         
-        # Check extension
+        Args:
+            file_path: Path to file to validate
+            
+        Returns:
+            Tuple of (is_valid, reason)
+        """
+        # Check extension first: rejected files are never stat()ed or opened
         extension = file_path.suffix.lower().lstrip('.')
         
         # Check if explicitly blocked
@@ -96,10 +185,37 @@ class FileValidator:
             logger.warning(f"Extension not in allowed list: {extension}")
             return False, f"File type not allowed: .{extension}"
         
-        # Validate MIME type using magic
-        if self.magic:
-            try:
-                mime_type = self.magic.from_file(str(file_path))
+        # One stat answers existence, file type and size
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return False, "File does not exist"
+        except Exception as e:
+            logger.error(f"Error checking file size: {e}")
+            return False, "Cannot read file"
+        
+        if not stat.S_ISREG(st.st_mode):
+            return False, "Not a regular file"
+        
+        # Check file size
+        file_size = st.st_size
+        if file_size == 0:
+            return False, "File is empty"
+        
+        if file_size > self.max_file_size:
+            max_mb = self.max_file_size / (1024 * 1024)
+            return False, f"File too large (max {max_mb:.0f} MB)"
+        
+        # Validate MIME type: common formats by signature, anything else using magic
+        try:
+            header = self._read_header(file_path)
+            fast_mime = self._fast_mime(header, extension)
+            
+            if fast_mime:
+                logger.debug(f"Signature matched for {file_path.name}: {fast_mime}")
+            
+            elif self.magic:
+                mime_type = self._magic().from_buffer(header)
                 logger.debug(f"Detected MIME type for {file_path.name}: {mime_type}")
                 
                 # Check for dangerous MIME types
@@ -114,10 +230,10 @@ class FileValidator:
                         f"MIME type mismatch: expected {expected_mime}, got {mime_type}"
                     )
                     # Don't reject, just log warning - some files have unexpected MIME types
-            
-            except Exception as e:
-                logger.error(f"Error detecting MIME type: {e}")
-                # Don't reject file on MIME detection error
+        
+        except Exception as e:
+            logger.error(f"Error detecting MIME type: {e}")
+            # Don't reject file on MIME detection error
         
         logger.info(f"File validation passed: {file_path.name}")
         return True, "Valid"
@@ -127,70 +243,107 @@ class FileValidator:
         Get expected MIME type prefix for extension
         
         Args:
-            extension: File extension (without dot)
+            extension: Lowercase file extension (without dot)
             
         Returns:
             Expected MIME type prefix or None
         """
-        mime_map = {
-            'pdf': 'application/pdf',
-            'doc': 'application/msword',
-            'docx': 'application/vnd.openxmlformats',
-            'xls': 'application/vnd.ms-excel',
-            'xlsx': 'application/vnd.openxmlformats',
-            'ppt': 'application/vnd.ms-powerpoint',
-            'pptx': 'application/vnd.openxmlformats',
-            'odt': 'application/vnd.oasis',
-            'ods': 'application/vnd.oasis',
-            'odp': 'application/vnd.oasis',
-            'txt': 'text/',
-            'rtf': 'application/rtf',
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'gif': 'image/gif',
-            'bmp': 'image/bmp',
-            'tiff': 'image/tiff',
-        }
+        return _MIME_MAP.get(extension)
+    
+    def iter_validated(self, file_paths: list) -> Iterator[Tuple[str, Tuple[bool, str]]]:
+        """
+        Validate files concurrently, yielding each result as it completes
+        
+        Lets a caller start the next stage (e.g. scanning) on files that have
+        already passed while the rest are still being validated.
         
-        return mime_map.get(extension.lower())
+        Args:
+            file_paths: List of file paths to validate
+            
+        Yields:
+            (file_path, (is_valid, reason)) tuples in completion order
+        """
+        if not file_paths:
+            return
+        
+        workers = max(1, min(self.validation_workers, len(file_paths)))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.validate_file, Path(file_path)): str(file_path)
+                for file_path in file_paths
+            }
+            
+            for future in as_completed(futures):
+                yield futures[future], future.result()
     
-    def validate_multiple_files(self, file_paths: list) -> dict:
+    def validate_multiple_files(self, file_paths: list,
+                                progress_callback: Optional[Callable[[str], None]] = None) -> dict:
         """
-        Validate multiple files
+        Validate multiple files concurrently
         
         Args:
             file_paths: List of file paths to validate
+            progress_callback: Called with each file path as its validation completes
             
         Returns:
             Dictionary mapping file paths to (is_valid, reason) tuples
         """
         results = {}
         
-        for file_path in file_paths:
-            is_valid, reason = self.validate_file(Path(file_path))
-            results[str(file_path)] = (is_valid, reason)
+        for file_path, result in self.iter_validated(file_paths):
+            results[file_path] = result
+            
+            if progress_callback:
+                progress_callback(file_path)
         
         return results
     
+    def _file_size(self, file_path) -> int:
+        """
+        Get a file's size, logging and counting it as 0 if it cannot be read
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            Size in bytes
+        """
+        try:
+            return os.stat(file_path).st_size
+        except Exception as e:
+            logger.error(f"Error getting file size for {file_path}: {e}")
+            return 0
+    
     def check_total_size(self, file_paths: list) -> Tuple[bool, int]:
         """
         Check if total size of files is within limit
         
+        Files are stat()ed concurrently. Counting stops as soon as the limit
+        is exceeded.
+        
         Args:
             file_paths: List of file paths
             
         Returns:
-            Tuple of (is_within_limit, total_size_bytes)
+            Tuple of (is_within_limit, total_size_bytes); when over the limit the
+            total covers only the files counted before stopping
         """
         max_total = self.config.get('max_total_size_mb', 500) * 1024 * 1024
         
         total_size = 0
-        for file_path in file_paths:
+        
+        if file_paths:
+            workers = max(1, min(self.validation_workers, len(file_paths)))
+            executor = ThreadPoolExecutor(max_workers=workers)
             try:
-                total_size += Path(file_path).stat().st_size
-            except Exception as e:
-                logger.error(f"Error getting file size for {file_path}: {e}")
+                sizes = executor.map(self._file_size, file_paths)
+                for size in sizes:
+                    total_size += size
+                    if total_size > max_total:
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
         
         is_within_limit = total_size <= max_total
         
@@ -218,12 +371,12 @@ class FileValidator:
         }
         
         try:
-            stat = file_path.stat()
-            info['size'] = stat.st_size
-            info['size_human'] = self._format_size(stat.st_size)
+            st = os.stat(file_path)
+            info['size'] = st.st_size
+            info['size_human'] = self._format_size(st.st_size)
             
             if self.magic:
-                info['mime_type'] = self.magic.from_file(str(file_path))
+                info['mime_type'] = self._detect_mime(file_path)
         
         except Exception as e:
             logger.error(f"Error getting file info: {e}")
@@ -3,10 +3,13 @@ USB Defender Kiosk - Cloud Transfer
 Transfers files to S3-compatible cloud storage
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict
-from datetime import datetime
+import time
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 from src.transfer.transfer_manager import TransferManager, TransferResult
 from src.utils.logger import KioskLogger
@@ -34,6 +37,13 @@ class CloudTransferManager(TransferManager):
         self.access_key = config.get('access_key', '')
         self.secret_key = config.get('secret_key', '')
         self.prefix = config.get('prefix', 'transfers/')
+        # Files uploaded at once, and parts in flight per multipart upload
+        self.upload_workers = config.get('upload_workers', 8)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config.get('multipart_threshold_mb', 8) * 1024 * 1024,
+            max_concurrency=config.get('multipart_concurrency', 4),
+            use_threads=True
+        )
         
         # Ensure prefix ends with /
         if self.prefix and not self.prefix.endswith('/'):
@@ -56,7 +66,14 @@ class CloudTransferManager(TransferManager):
                 endpoint_url=self.endpoint,
                 aws_access_key_id=self.access_key,
                 aws_secret_access_key=self.secret_key,
-                region_name=self.region
+                region_name=self.region,
+                # Enough pooled connections for every concurrent upload part, kept
+                # alive between uploads so later ones skip the TLS handshake
+                config=Config(
+                    max_pool_connections=self.upload_workers * self.transfer_config.max_request_concurrency,
+                    tcp_keepalive=True,
+                    retries={'max_attempts': 3, 'mode': 'adaptive'}
+                )
             )
             
             logger.info("S3 client initialized")
@@ -91,53 +108,24 @@ class CloudTransferManager(TransferManager):
             return results
         
         # Create session prefix
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         session_prefix = f"{self.prefix}{session_id}_{timestamp}/"
         
         results = {}
         
-        for file_path in file_paths:
-            result = TransferResult(file_path)
+        if file_paths:
+            workers = max(1, min(self.upload_workers, len(file_paths)))
             
-            try:
-                # Determine S3 key
-                # Preserve directory structure
-                parts = file_path.parts
-                if session_id in parts:
-                    session_idx = parts.index(session_id)
-                    relative_parts = parts[session_idx + 1:]
-                    relative_path = '/'.join(relative_parts) if relative_parts else file_path.name
-                else:
-                    relative_path = file_path.name
-                
-                s3_key = f"{session_prefix}{relative_path}"
-                
-                # Upload file
-                self.s3_client.upload_file(
-                    str(file_path),
-                    self.bucket,
-                    s3_key
-                )
+            # The S3 client is thread-safe; uploads overlap each other's round-trips
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._upload_file, file_path, f"{session_prefix}{relative_path}")
+                    for file_path, relative_path in zip(file_paths, self._relative_paths(file_paths, session_id))
+                ]
                 
-                result.destination = f"s3://{self.bucket}/{s3_key}"
-                result.success = True
-                
-                self._log_transfer(file_path, result.destination, True)
-            
-            except (ClientError, BotoCoreError) as e:
-                result.error_message = str(e)
-                self._log_transfer(
-                    file_path,
-                    f"s3://{self.bucket}",
-                    False,
-                    str(e)
-                )
-            
-            except Exception as e:
-                result.error_message = str(e)
-                logger.error(f"Unexpected error uploading {file_path.name}: {e}", exc_info=True)
-            
-            results[str(file_path)] = result
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[str(result.source_path)] = result
         
         # Summary
         successful = sum(1 for r in results.values() if r.success)
@@ -145,6 +133,48 @@ class CloudTransferManager(TransferManager):
         
         return results
     
+    def _upload_file(self, file_path: Path, s3_key: str) -> TransferResult:
+        """
+        Upload one file
+        
+        Args:
+            file_path: File to upload
+            s3_key: Destination key
+            
+        Returns:
+            TransferResult for the file
+        """
+        result = TransferResult(file_path)
+        
+        try:
+            # Upload file (multipart above the threshold)
+            self.s3_client.upload_file(
+                str(file_path),
+                self.bucket,
+                s3_key,
+                Config=self.transfer_config
+            )
+            
+            result.destination = f"s3://{self.bucket}/{s3_key}"
+            result.success = True
+            
+            self._log_transfer(file_path, result.destination, True)
+        
+        except (ClientError, BotoCoreError) as e:
+            result.error_message = str(e)
+            self._log_transfer(
+                file_path,
+                f"s3://{self.bucket}",
+                False,
+                str(e)
+            )
+        
+        except Exception as e:
+            result.error_message = str(e)
+            logger.error(f"Unexpected error uploading {file_path.name}: {e}", exc_info=True)
+        
+        return result
+    
     def test_connection(self) -> bool:
         """
         Test cloud storage connection
@@ -3,11 +3,12 @@ USB Defender Kiosk - Local Transfer
 Transfers files to local filesystem directory
 """
 
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
 from src.transfer.transfer_manager import TransferManager, TransferResult
+from src.utils.file_utils import copy_file
 from src.utils.logger import KioskLogger
 
 
@@ -29,6 +30,8 @@ class LocalTransferManager(TransferManager):
         self.output_directory = Path(config.get('output_directory', '/var/usb-defender/transfers'))
         self.create_session_folders = config.get('create_session_folders', True)
         self.session_folder_format = config.get('session_folder_format', '%Y%m%d_%H%M%S')
+        # Files copied concurrently
+        self.copy_workers = config.get('copy_workers', 8)
         
         # Create base directory if it doesn't exist
         self.output_directory.mkdir(parents=True, exist_ok=True)
@@ -58,43 +61,34 @@ class LocalTransferManager(TransferManager):
         dest_dir.mkdir(parents=True, exist_ok=True)
         
         results = {}
+        copies = []
         
-        for file_path in file_paths:
-            result = TransferResult(file_path)
-            
+        # Preserve directory structure relative to session
+        # If file is /tmp/session123/file1/page1.png
+        # We want to copy to dest_dir/file1/page1.png
+        for file_path, relative_path in zip(file_paths, self._relative_paths(file_paths, session_id)):
+            copies.append((file_path, dest_dir / relative_path))
+        
+        # Create each destination directory once, parents first so that
+        # mkdir only walks up for ancestors not created yet
+        for directory in sorted({dest_path.parent for _, dest_path in copies}, key=lambda p: len(p.parts)):
             try:
-                # Preserve directory structure relative to session
-                # If file is /tmp/session123/file1/page1.png
-                # We want to copy to dest_dir/file1/page1.png
-                
-                # Find the relative path from the session directory
-                # Assume files are structured as: base/session_id/file_name/image.png
-                parts = file_path.parts
-                
-                # Find session_id in path
-                if session_id in parts:
-                    session_idx = parts.index(session_id)
-                    relative_parts = parts[session_idx + 1:]  # Everything after session_id
-                    relative_path = Path(*relative_parts) if relative_parts else file_path.name
-                else:
-                    relative_path = file_path.name
-                
-                dest_path = dest_dir / relative_path
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file
-                shutil.copy2(file_path, dest_path)
-                
-                result.destination = str(dest_path)
-                result.success = True
-                
-                self._log_transfer(file_path, str(dest_path), True)
-            
+                directory.mkdir(parents=True, exist_ok=True)
             except Exception as e:
-                result.error_message = str(e)
-                self._log_transfer(file_path, str(dest_dir), False, str(e))
+                logger.error(f"Cannot create directory {directory}: {e}")
+        
+        if copies:
+            workers = max(1, min(self.copy_workers, len(copies)))
             
-            results[str(file_path)] = result
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._copy_one, file_path, dest_path, dest_dir)
+                    for file_path, dest_path in copies
+                ]
+                
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[str(result.source_path)] = result
         
         # Summary
         successful = sum(1 for r in results.values() if r.success)
@@ -103,6 +97,35 @@ class LocalTransferManager(TransferManager):
         
         return results
     
+    def _copy_one(self, file_path: Path, dest_path: Path, dest_dir: Path) -> TransferResult:
+        """
+        Copy one file to its destination
+        
+        Args:
+            file_path: Source file
+            dest_path: Destination file
+            dest_dir: Session destination directory (for failure logs)
+            
+        Returns:
+            TransferResult for the file
+        """
+        result = TransferResult(file_path)
+        
+        try:
+            # Copy file
+            copy_file(file_path, dest_path)
+            
+            result.destination = str(dest_path)
+            result.success = True
+            
+            self._log_transfer(file_path, str(dest_path), True)
+        
+        except Exception as e:
+            result.error_message = str(e)
+            self._log_transfer(file_path, str(dest_dir), False, str(e))
+        
+        return result
+    
     def test_connection(self) -> bool:
         """
         Test if destination directory is writable
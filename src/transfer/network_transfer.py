@@ -3,17 +3,82 @@ USB Defender Kiosk - Network Transfer
 Transfers files to SMB/CIFS network share
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict
-from datetime import datetime
+import time
+import queue
+import shutil
 import tempfile
 from smb.SMBConnection import SMBConnection
 from src.transfer.transfer_manager import TransferManager, TransferResult
 from src.utils.logger import KioskLogger
 
+try:
+    import smbclient
+except ImportError:
+    smbclient = None
+
 
 logger = KioskLogger.get_logger('transfer')
 
+# Bytes per write with smbprotocol; SMB3 servers typically accept up to 8 MB
+SMB_WRITE_CHUNK = 1024 * 1024
+
+
+class SMBProtocolConnection:
+    """
+    smbprotocol session behind the subset of the pysmb SMBConnection API used here
+    
+    smbclient keeps one SMB3 connection per server and multiplexes requests
+    from all threads over it, so instances are cheap and close() is a no-op.
+    """
+    
+    def __init__(self, server: str, username: str, password: str, domain: str, timeout: int):
+        """
+        Register an authenticated session with the server
+        
+        Args:
+            server: Server host name
+            username: User name
+            password: Password
+            domain: Authentication domain
+            timeout: Connection timeout in seconds
+        """
+        self.server = server
+        
+        if domain and username and '\\' not in username:
+            username = f"{domain}\\{username}"
+        
+        smbclient.register_session(
+            server,
+            username=username,
+            password=password,
+            port=445,
+            connection_timeout=timeout
+        )
+    
+    def _unc(self, share: str, path: str) -> str:
+        """Build the UNC path of a file on a share"""
+        parts = [f"\\\\{self.server}", share] + [part for part in path.split('/') if part]
+        return '\\'.join(parts)
+    
+    def createDirectory(self, share: str, path: str):
+        """Create one directory (raises if it exists, like pysmb)"""
+        smbclient.mkdir(self._unc(share, path))
+    
+    def storeFile(self, share: str, path: str, file_obj, timeout: int = 30):
+        """Write a local file object to the share in large chunks"""
+        with smbclient.open_file(self._unc(share, path), mode='wb') as remote:
+            shutil.copyfileobj(file_obj, remote, SMB_WRITE_CHUNK)
+    
+    def listPath(self, share: str, path: str) -> list:
+        """List a directory on the share"""
+        return smbclient.listdir(self._unc(share, path))
+    
+    def close(self):
+        """Nothing to do; smbclient keeps the session for reuse"""
+
 
 class NetworkTransferManager(TransferManager):
     """Transfers files to network share via SMB/CIFS"""
@@ -41,22 +106,42 @@ class NetworkTransferManager(TransferManager):
         self.password = config.get('password', '')
         self.domain = config.get('domain', 'WORKGROUP')
         self.timeout = config.get('timeout', 30)
+        # Parallel uploads, one SMB connection each (SMBConnection is not thread-safe)
+        self.upload_workers = config.get('upload_workers', 4)
+        
+        # SMB client library: pysmb, or smbprotocol for SMB3 with large writes
+        self.client = config.get('client', 'pysmb')
+        if self.client == 'smbprotocol' and smbclient is None:
+            logger.warning("smbprotocol is not installed, using pysmb")
+            self.client = 'pysmb'
+        
+        # Remote directories created (or found) during the current transfer
+        self._created_dirs = set()
         
         self.client_name = 'USB-DEFENDER-KIOSK'
         self.server_name = self.server.split('.')[0].upper()  # NetBIOS name
         
         logger.info(f"Network transfer manager initialized: //{self.server}/{self.share_name}")
     
-    def _connect(self) -> SMBConnection:
+    def _connect(self):
         """
         Create SMB connection
         
         Returns:
-            SMBConnection instance
+            SMBConnection, or SMBProtocolConnection if configured
             
         Raises:
             Exception if connection fails
         """
+        if self.client == 'smbprotocol':
+            return SMBProtocolConnection(
+                self.server,
+                self.username,
+                self.password,
+                self.domain,
+                self.timeout
+            )
+        
         conn = SMBConnection(
             self.username,
             self.password,
@@ -87,59 +172,52 @@ class NetworkTransferManager(TransferManager):
         logger.info(f"Transferring {len(file_paths)} files to network share")
         
         results = {}
+        connections = []
+        self._created_dirs = set()
         
         try:
             # Connect to share
-            conn = self._connect()
+            connections.append(self._connect())
             
             # Create session folder on share
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = time.strftime('%Y%m%d_%H%M%S')
             remote_base = f"{session_id}_{timestamp}"
             
-            # Transfer each file
-            for file_path in file_paths:
-                result = TransferResult(file_path)
-                
+            # Preserve directory structure
+            uploads = [
+                (file_path, f"{remote_base}/{relative_path}".replace('\\', '/'))
+                for file_path, relative_path in zip(file_paths, self._relative_paths(file_paths, session_id))
+            ]
+            
+            # Create each directory once, before workers race to use it
+            remote_dirs = sorted({
+                remote_path.rsplit('/', 1)[0] for _, remote_path in uploads if '/' in remote_path
+            })
+            for remote_dir in remote_dirs:
+                self._create_remote_directory(connections[0], self.share_name, remote_dir)
+            
+            # Extra connections are best effort; fewer just means less parallelism
+            workers = max(1, min(self.upload_workers, len(uploads)))
+            while len(connections) < workers:
                 try:
-                    # Determine remote path
-                    # Preserve directory structure
-                    parts = file_path.parts
-                    if session_id in parts:
-                        session_idx = parts.index(session_id)
-                        relative_parts = parts[session_idx + 1:]
-                        relative_path = '/'.join(relative_parts) if relative_parts else file_path.name
-                    else:
-                        relative_path = file_path.name
-                    
-                    remote_path = f"{remote_base}/{relative_path}".replace('\\', '/')
-                    
-                    # Create directory structure if needed
-                    remote_dir = '/'.join(remote_path.split('/')[:-1])
-                    if remote_dir:
-                        self._create_remote_directory(conn, self.share_name, remote_dir)
-                    
-                    # Upload file
-                    with open(file_path, 'rb') as f:
-                        conn.storeFile(self.share_name, remote_path, f, timeout=self.timeout)
-                    
-                    result.destination = f"//{self.server}/{self.share_name}/{remote_path}"
-                    result.success = True
-                    
-                    self._log_transfer(file_path, result.destination, True)
-                
+                    connections.append(self._connect())
                 except Exception as e:
-                    result.error_message = str(e)
-                    self._log_transfer(
-                        file_path,
-                        f"//{self.server}/{self.share_name}",
-                        False,
-                        str(e)
-                    )
-                
-                results[str(file_path)] = result
+                    logger.warning(f"Uploading with {len(connections)} connection(s): {e}")
+                    break
             
-            # Close connection
-            conn.close()
+            pool = queue.Queue()
+            for conn in connections:
+                pool.put(conn)
+            
+            with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+                futures = [
+                    executor.submit(self._upload_file, pool, file_path, remote_path)
+                    for file_path, remote_path in uploads
+                ]
+                
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[str(result.source_path)] = result
         
         except Exception as e:
             logger.error(f"Network transfer failed: {e}", exc_info=True)
@@ -151,12 +229,56 @@ class NetworkTransferManager(TransferManager):
                     result.error_message = f"Connection failed: {str(e)}"
                     results[str(file_path)] = result
         
+        finally:
+            # Close connections
+            for conn in connections:
+                conn.close()
+        
         # Summary
         successful = sum(1 for r in results.values() if r.success)
         logger.info(f"Network transfer complete: {successful}/{len(file_paths)} successful")
         
         return results
     
+    def _upload_file(self, pool: queue.Queue, file_path: Path, remote_path: str) -> TransferResult:
+        """
+        Upload one file over a connection checked out from the pool
+        
+        Args:
+            pool: Queue of idle SMB connections
+            file_path: Local file path
+            remote_path: Destination path relative to the share
+            
+        Returns:
+            TransferResult for the file
+        """
+        result = TransferResult(file_path)
+        conn = pool.get()
+        
+        try:
+            # Upload file
+            with open(file_path, 'rb') as f:
+                conn.storeFile(self.share_name, remote_path, f, timeout=self.timeout)
+            
+            result.destination = f"//{self.server}/{self.share_name}/{remote_path}"
+            result.success = True
+            
+            self._log_transfer(file_path, result.destination, True)
+        
+        except Exception as e:
+            result.error_message = str(e)
+            self._log_transfer(
+                file_path,
+                f"//{self.server}/{self.share_name}",
+                False,
+                str(e)
+            )
+        
+        finally:
+            pool.put(conn)
+        
+        return result
+    
     def _create_remote_directory(self, conn: SMBConnection, share: str, path: str):
         """
         Create remote directory structure
@@ -176,6 +298,10 @@ class NetworkTransferManager(TransferManager):
             
             current_path = f"{current_path}/{part}" if current_path else part
             
+            # Parents shared with earlier paths are already done
+            if current_path in self._created_dirs:
+                continue
+            
             try:
                 # Try to create directory (will fail if exists, which is fine)
                 conn.createDirectory(share, current_path)
@@ -183,6 +309,8 @@ class NetworkTransferManager(TransferManager):
             except Exception:
                 # Directory probably exists
                 pass
+            
+            self._created_dirs.add(current_path)
     
     def test_connection(self) -> bool:
         """
@@ -3,21 +3,64 @@ USB Defender Kiosk - Secure USB Transfer
 Two-USB workflow for airgapped systems
 """
 
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
+import functools
+import os
 import subprocess
 
 from src.transfer.transfer_manager import TransferManager, TransferResult
 from src.usb.secure_usb_manager import SecureUSBManager
 from src.usb.device_monitor import USBDevice
+from src.utils.file_utils import copy_file
 from src.utils.logger import KioskLogger
 
 
 logger = KioskLogger.get_logger('transfer')
 
 
+@functools.lru_cache(maxsize=32)
+def _udev_properties(parent_device: str, rdev: int, ctime_ns: int) -> Dict[str, str]:
+    """
+    Run udevadm for a disk, cached per device node instance
+    
+    Args:
+        parent_device: Disk device node (e.g., /dev/sdb)
+        rdev: Device number of the node
+        ctime_ns: Change time of the node
+        
+    Returns:
+        Properties in udevadm output order
+        
+    Raises:
+        RuntimeError: If udevadm fails; failures are not cached
+    """
+    result = subprocess.run(
+        ['udevadm', 'info', '--query=property', '--name=' + parent_device],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    
+    if result.returncode != 0:
+        raise RuntimeError(f"udevadm exited with {result.returncode}: {result.stderr.strip()}")
+    
+    properties = {}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.partition('=')
+        if sep:
+            properties[key.strip()] = value.strip()
+    
+    return properties
+
+
+def clear_udev_cache():
+    """Forget cached udev device properties, e.g. on USB hotplug events"""
+    _udev_properties.cache_clear()
+
+
 class SecureUSBTransferManager(TransferManager):
     """Transfers files to registered secure USB devices"""
     
@@ -33,6 +76,15 @@ class SecureUSBTransferManager(TransferManager):
         db_path = config.get('database_path', '/etc/usb-defender/secure_usb.db')
         self.usb_manager = SecureUSBManager(db_path)
         self.create_session_folders = config.get('create_session_folders', True)
+        # Files copied concurrently; flash drives slow down with many writers
+        self.copy_workers = config.get('copy_workers', 4)
+        # Files of at least large_file_mb are copied on their own, smaller pool
+        self.large_file_bytes = int(config.get('large_file_mb', 1) * 1024 * 1024)
+        self.large_copy_workers = config.get('large_copy_workers', 2)
+        # Flush each file to the drive before reporting it transferred
+        self.sync_writes = config.get('sync_writes', True)
+        # Serial of the last device verify_secure_usb accepted
+        self._verified_serial: Optional[str] = None
         
         logger.info("Secure USB transfer manager initialized (airgapped mode)")
     
@@ -47,9 +99,10 @@ class SecureUSBTransferManager(TransferManager):
             Tuple of (is_registered, message)
         """
         # Get device information
-        serial = self._get_device_serial(device.device_node)
-        vendor_id = self._get_device_vendor_id(device.device_node)
-        product_id = self._get_device_product_id(device.device_node)
+        properties = self._query_udev(device.device_node)
+        serial = self._serial_from_properties(properties)
+        vendor_id = properties.get('ID_VENDOR_ID')
+        product_id = properties.get('ID_MODEL_ID')
         
         if not serial:
             return False, "Unable to read USB device serial number"
@@ -58,6 +111,7 @@ class SecureUSBTransferManager(TransferManager):
         is_registered = self.usb_manager.is_registered(serial, vendor_id, product_id)
         
         if is_registered:
+            self._verified_serial = serial
             registered_device = self.usb_manager.get_registered_device(serial)
             if registered_device:
                 message = f"Verified secure USB: {registered_device.label}"
@@ -74,81 +128,43 @@ class SecureUSBTransferManager(TransferManager):
                             product_id=product_id)
             return False, message
     
-    def _get_device_serial(self, device_node: str) -> Optional[str]:
+    def _query_udev(self, device_node: str) -> Dict[str, str]:
         """
-        Get USB device serial number
+        Get all udev properties of the USB disk behind a device node
         
         Args:
             device_node: Device node (e.g., /dev/sdb1)
             
         Returns:
-            Serial number or None
+            Properties in udevadm output order, empty if the query failed
         """
         try:
             # Get parent device (remove partition number)
             parent_device = device_node.rstrip('0123456789')
             
-            # Use udevadm to get serial
-            result = subprocess.run(
-                ['udevadm', 'info', '--query=all', '--name=' + parent_device],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'ID_SERIAL_SHORT=' in line:
-                        serial = line.split('=')[1].strip()
-                        return serial
-                    elif 'ID_SERIAL=' in line and 'ID_SERIAL_SHORT' not in line:
-                        serial = line.split('=')[1].strip()
-                        return serial
+            # The node is recreated on every insertion, so a different stick on
+            # the same node never matches a cached entry
+            st = os.stat(parent_device)
+            return dict(_udev_properties(parent_device, st.st_rdev, st.st_ctime_ns))
         
         except Exception as e:
-            logger.error(f"Error getting device serial: {e}")
-        
-        return None
+            logger.error(f"Error querying udev for {device_node}: {e}")
+            return {}
     
-    def _get_device_vendor_id(self, device_node: str) -> Optional[str]:
-        """Get USB vendor ID"""
-        try:
-            parent_device = device_node.rstrip('0123456789')
-            result = subprocess.run(
-                ['udevadm', 'info', '--query=all', '--name=' + parent_device],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'ID_VENDOR_ID=' in line:
-                        return line.split('=')[1].strip()
-        
-        except Exception as e:
-            logger.error(f"Error getting vendor ID: {e}")
+    def _serial_from_properties(self, properties: Dict[str, str]) -> Optional[str]:
+        """
+        Pick the serial number out of udev properties
         
-        return None
-    
-    def _get_device_product_id(self, device_node: str) -> Optional[str]:
-        """Get USB product ID"""
-        try:
-            parent_device = device_node.rstrip('0123456789')
-            result = subprocess.run(
-                ['udevadm', 'info', '--query=all', '--name=' + parent_device],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+        Args:
+            properties: Properties from _query_udev
             
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'ID_MODEL_ID=' in line:
-                        return line.split('=')[1].strip()
-        
-        except Exception as e:
-            logger.error(f"Error getting product ID: {e}")
+        Returns:
+            Serial number or None
+        """
+        # Whichever of the two udev lists first, as registrations were made that way
+        for key, value in properties.items():
+            if key in ('ID_SERIAL_SHORT', 'ID_SERIAL'):
+                return value
         
         return None
     
@@ -199,43 +215,58 @@ class SecureUSBTransferManager(TransferManager):
         dest_dir.mkdir(parents=True, exist_ok=True)
         
         results = {}
+        copies = []
         
-        for file_path in file_paths:
-            result = TransferResult(file_path)
-            
+        # Preserve directory structure relative to session
+        for file_path, relative_path in zip(file_paths, self._relative_paths(file_paths, session_id)):
+            copies.append((file_path, dest_dir / relative_path))
+        
+        # Create each destination directory once, parents first
+        directories = sorted({dest_path.parent for _, dest_path in copies}, key=lambda p: len(p.parts))
+        for directory in directories:
             try:
-                # Preserve directory structure
-                parts = file_path.parts
-                if session_id in parts:
-                    session_idx = parts.index(session_id)
-                    relative_parts = parts[session_idx + 1:]
-                    relative_path = Path(*relative_parts) if relative_parts else file_path.name
-                else:
-                    relative_path = file_path.name
-                
-                dest_path = dest_dir / relative_path
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file
-                shutil.copy2(file_path, dest_path)
-                
-                result.destination = str(dest_path)
-                result.success = True
-                
-                self._log_transfer(file_path, str(dest_path), True)
-            
+                directory.mkdir(parents=True, exist_ok=True)
             except Exception as e:
-                result.error_message = str(e)
-                self._log_transfer(file_path, str(dest_dir), False, str(e))
+                logger.error(f"Cannot create directory {directory}: {e}")
+        
+        # Small files are bound by per-file syscalls and large ones by bandwidth:
+        # copy them on separate pools so a few big files neither wait behind
+        # many small ones nor thrash the drive with too many parallel streams
+        small_copies = []
+        large_copies = []
+        for file_path, dest_path in copies:
+            try:
+                is_large = os.stat(file_path).st_size >= self.large_file_bytes
+            except OSError:
+                is_large = False
+            (large_copies if is_large else small_copies).append((file_path, dest_path))
+        
+        small_workers = max(1, min(self.copy_workers, len(small_copies)))
+        large_workers = max(1, min(self.large_copy_workers, len(large_copies)))
+        
+        with ThreadPoolExecutor(max_workers=large_workers) as large_executor, \
+                ThreadPoolExecutor(max_workers=small_workers) as small_executor:
+            futures = [
+                large_executor.submit(self._copy_one, file_path, dest_path, dest_dir)
+                for file_path, dest_path in large_copies
+            ]
+            futures += [
+                small_executor.submit(self._copy_one, file_path, dest_path, dest_dir)
+                for file_path, dest_path in small_copies
+            ]
             
-            results[str(file_path)] = result
+            for future in as_completed(futures):
+                result = future.result()
+                results[str(result.source_path)] = result
+        
+        if self.sync_writes:
+            # Make the new directory entries durable too
+            self._sync_directories([dest_dir] + directories)
         
         # Log usage
         successful_count = sum(1 for r in results.values() if r.success)
-        if successful_count > 0:
-            serial = self._get_device_serial(secure_device.device_node)
-            if serial:
-                self.usb_manager.log_usage(serial, session_id, successful_count)
+        if successful_count > 0 and self._verified_serial:
+            self.usb_manager.log_usage(self._verified_serial, session_id, successful_count)
         
         # Summary
         logger.info(f"Secure USB transfer complete: {successful_count}/{len(file_paths)} successful")
@@ -243,6 +274,52 @@ class SecureUSBTransferManager(TransferManager):
         
         return results
     
+    def _copy_one(self, file_path: Path, dest_path: Path, dest_dir: Path) -> TransferResult:
+        """
+        Copy one file to the secure USB
+        
+        Args:
+            file_path: Source file
+            dest_path: Destination file
+            dest_dir: Session destination directory (for failure logs)
+            
+        Returns:
+            TransferResult for the file
+        """
+        result = TransferResult(file_path)
+        
+        try:
+            # Copy file
+            copy_file(file_path, dest_path, fsync=self.sync_writes)
+            
+            result.destination = str(dest_path)
+            result.success = True
+            
+            self._log_transfer(file_path, str(dest_path), True)
+        
+        except Exception as e:
+            result.error_message = str(e)
+            self._log_transfer(file_path, str(dest_dir), False, str(e))
+        
+        return result
+    
+    def _sync_directories(self, directories: List[Path]):
+        """
+        Flush directories to the drive
+        
+        Args:
+            directories: Directories to flush
+        """
+        for directory in dict.fromkeys(directories):
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                logger.warning(f"Cannot flush directory {directory}: {e}")
+    
     def test_connection(self) -> bool:
         """
         Test if any secure USB is available
@@ -279,9 +356,10 @@ class SecureUSBTransferManager(TransferManager):
         Returns:
             Dictionary with device information
         """
-        serial = self._get_device_serial(device.device_node)
-        vendor_id = self._get_device_vendor_id(device.device_node)
-        product_id = self._get_device_product_id(device.device_node)
+        properties = self._query_udev(device.device_node)
+        serial = self._serial_from_properties(properties)
+        vendor_id = properties.get('ID_VENDOR_ID')
+        product_id = properties.get('ID_MODEL_ID')
         
         return {
             'serial': serial or 'UNKNOWN',
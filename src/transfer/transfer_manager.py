@@ -79,6 +79,41 @@ class TransferManager(ABC):
         """
         pass
     
+    def _relative_paths(self, file_paths: List[Path], session_id: str) -> List[str]:
+        """
+        Get each file's path below the session directory, in POSIX form
+        
+        The session directory is located once, from the first path containing
+        session_id; files outside it keep just their name.
+        
+        Args:
+            file_paths: Files being transferred
+            session_id: Session identifier
+            
+        Returns:
+            Relative paths, in the order of file_paths
+        """
+        session_root = None
+        for file_path in file_paths:
+            parts = file_path.parts
+            if session_id in parts:
+                session_root = Path(*parts[:parts.index(session_id) + 1])
+                break
+        
+        relative_paths = []
+        for file_path in file_paths:
+            relative_path = file_path.name
+            if session_root is not None:
+                try:
+                    relative_path = file_path.relative_to(session_root).as_posix()
+                except ValueError:
+                    pass
+                if relative_path == '.':
+                    relative_path = file_path.name
+            relative_paths.append(relative_path)
+        
+        return relative_paths
+    
     def _log_transfer(self, source: Path, destination: str, success: bool, error: str = ""):
         """
         Log transfer operation
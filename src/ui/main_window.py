@@ -20,7 +20,7 @@ from src.scanner.clamav_scanner import ClamAVScanner, ScanResult
 from src.scanner.file_validator import FileValidator
 from src.converter.converter_manager import ConverterManager
 from src.transfer.transfer_manager import create_transfer_manager
-from src.transfer.secure_usb_transfer import SecureUSBTransferManager
+from src.transfer.secure_usb_transfer import SecureUSBTransferManager, clear_udev_cache
 from src.utils.logger import KioskLogger
 from src.utils.config import ConfigManager
 
@@ -52,35 +52,59 @@ class ProcessingThread(QThread):
             self.progress.emit("Validating files...", 0)
             validator = FileValidator(self.config.get_file_config())
             
+            scanner = ClamAVScanner(self.config.get_clamav_config())
+            scanner_available = scanner.is_available()
+            
+            if not scanner_available:
+                logger.warning("ClamAV not available, skipping virus scan")
+            
             valid_files = []
-            for file_path in self.files:
-                is_valid, reason = validator.validate_file(file_path)
-                if is_valid:
-                    valid_files.append(file_path)
-                else:
-                    logger.warning(f"File validation failed for {file_path.name}: {reason}")
-                
+            files_by_name = {str(file_path): file_path for file_path in self.files}
+            
+            def validated_files():
+                """Yield files as they pass validation so scanning overlaps it"""
+                nonlocal current_step
+                for name, (is_valid, reason) in validator.iter_validated(self.files):
+                    current_step += 1
+                    progress_pct = int((current_step / total_steps) * 100)
+                    self.progress.emit(f"Validating: {Path(name).name}", progress_pct)
+                    
+                    if is_valid:
+                        valid_files.append(files_by_name[name])
+                        yield name
+                    else:
+                        logger.warning(f"File validation failed for {Path(name).name}: {reason}")
+            
+            # Step 2: Scan files with ClamAV, starting on each file as soon as
+            # it passes validation
+            clean_files = []
+            infected_count = 0
+            
+            def scan_progress(file_path):
+                nonlocal current_step
                 current_step += 1
                 progress_pct = int((current_step / total_steps) * 100)
-                self.progress.emit(f"Validating: {file_path.name}", progress_pct)
+                self.progress.emit(f"Scanning: {Path(file_path).name}", progress_pct)
+            
+            if scanner_available:
+                scan_results = scanner.scan_multiple_files(validated_files(), scan_progress)
+            else:
+                for _ in validated_files():
+                    pass
+                scan_results = {}
+                current_step += len(valid_files)
             
             if not valid_files:
                 self.finished.emit(False, "No valid files to process", {})
                 return
             
-            # Step 2: Scan files with ClamAV
-            self.progress.emit("Scanning for malware...", 33)
-            scanner = ClamAVScanner(self.config.get_clamav_config())
-            
-            if not scanner.is_available():
-                logger.warning("ClamAV not available, skipping virus scan")
-            
-            clean_files = []
-            infected_count = 0
+            # Keep the original file order for the later stages
+            order = {str(file_path): index for index, file_path in enumerate(self.files)}
+            valid_files.sort(key=lambda file_path: order[str(file_path)])
             
             for file_path in valid_files:
-                if scanner.is_available():
-                    scan_result, details = scanner.scan_file(file_path)
+                if str(file_path) in scan_results:
+                    scan_result, details = scan_results[str(file_path)]
                     
                     if scan_result == ScanResult.CLEAN:
                         clean_files.append(file_path)
@@ -93,10 +117,6 @@ class ProcessingThread(QThread):
                         logger.warning(f"Scan error for {file_path.name}, including anyway")
                 else:
                     clean_files.append(file_path)
-                
-                current_step += 1
-                progress_pct = int((current_step / total_steps) * 100)
-                self.progress.emit(f"Scanning: {file_path.name}", progress_pct)
             
             if not clean_files:
                 message = f"All files were infected or invalid ({infected_count} infected)"
@@ -173,6 +193,7 @@ class MainWindow(QMainWindow):
         self.session_id: Optional[str] = None
         self.waiting_for_secure_usb = False
         self.converted_images: List[Path] = []
+        self.dashboard_window = None
         
         self._init_ui()
         self._setup_usb_monitor()
@@ -423,6 +444,7 @@ class MainWindow(QMainWindow):
             device: USB device
         """
         logger.info(f"USB device added: {device}")
+        clear_udev_cache()
         
         # Check if we're waiting for a secure USB
         if self.waiting_for_secure_usb:
@@ -457,6 +479,7 @@ class MainWindow(QMainWindow):
             device: USB device
         """
         logger.info(f"USB device removed: {device}")
+        clear_udev_cache()
         
         if device == self.current_device:
             self.current_device = None
@@ -767,9 +790,11 @@ class MainWindow(QMainWindow):
                 
                 dialog.exec()
             else:
-                # Show full dashboard
+                # Show full dashboard (keep a reference so it isn't garbage collected)
                 dashboard = DashboardWindow(self.config)
-                dashboard.show()
+                if dashboard.authenticated:
+                    self.dashboard_window = dashboard
+                    dashboard.show()
         except Exception as e:
             logger.error(f"Error opening dashboard: {e}", exc_info=True)
             QMessageBox.warning(
@@ -5,8 +5,9 @@ Manages registration and verification of trusted USB devices for output
 
 import sqlite3
 import json
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, List, Optional, Dict, Tuple
 from datetime import datetime
 from src.utils.logger import KioskLogger
 
@@ -77,15 +78,39 @@ class SecureUSBManager:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Registered devices by serial, loaded lazily; other managers (or processes)
+        # may write the same database, so it is tied to SQLite's data_version
+        self._cache: Optional[Dict[str, SecureUSBDevice]] = None
+        self._cache_stamp = None
+        # Long-lived connection whose data_version changes whenever any other
+        # connection commits to the database
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._version_lock = threading.Lock()
+        
         self._init_database()
         
         logger.info(f"Secure USB manager initialized: {self.db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the database
+        
+        Returns:
+            SQLite connection
+        """
+        conn = sqlite3.connect(str(self.db_path))
+        # Safe with WAL: a power loss can only drop the last commits, not corrupt the db
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
     def _init_database(self):
         """Initialize SQLite database"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # Persistent; readers no longer block writers and commits avoid rewriting pages
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS secure_usb_devices (
                 serial TEXT PRIMARY KEY,
@@ -109,11 +134,74 @@ class SecureUSBManager:
             )
         ''')
         
+        # History pages, counts and deletes are all per serial, newest first
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_usage_serial_ts
+            ON usage_log (serial, timestamp DESC)
+        ''')
+        
         conn.commit()
         conn.close()
         
         logger.info("Secure USB database initialized")
     
+    def _data_version(self) -> int:
+        """
+        Get the database's data version
+        
+        Unlike file timestamps this changes on every commit by another
+        connection, including this manager's own write connections.
+        
+        Returns:
+            PRAGMA data_version of the long-lived version connection
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            return self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def _devices(self) -> Dict[str, SecureUSBDevice]:
+        """
+        Get registered devices by serial, reloading only if the database changed
+        
+        Returns:
+            Dict of serial to SecureUSBDevice
+        """
+        stamp = self._data_version()
+        
+        if self._cache is None or stamp != self._cache_stamp:
+            devices = {}
+            
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT serial, vendor_id, product_id, label, notes, registered_date
+                FROM secure_usb_devices
+            ''')
+            
+            for row in cursor.fetchall():
+                devices[row[0]] = SecureUSBDevice(
+                    serial=row[0],
+                    vendor_id=row[1],
+                    product_id=row[2],
+                    label=row[3],
+                    notes=row[4],
+                    registered_date=row[5]
+                )
+            
+            conn.close()
+            
+            self._cache = devices
+            self._cache_stamp = stamp
+        
+        return self._cache
+    
+    def invalidate_cache(self):
+        """Drop cached registrations so the next lookup reads the database"""
+        self._cache = None
+        self._cache_stamp = None
+    
     def register_usb(self, device: SecureUSBDevice) -> bool:
         """
         Register a secure USB device
@@ -125,7 +213,7 @@ class SecureUSBManager:
             True if registered successfully
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -144,6 +232,8 @@ class SecureUSBManager:
             conn.commit()
             conn.close()
             
+            self.invalidate_cache()
+            
             logger.info(f"Registered secure USB: {device}")
             KioskLogger.audit("SECURE_USB_REGISTERED", 
                             serial=device.serial, 
@@ -166,7 +256,7 @@ class SecureUSBManager:
             True if unregistered successfully
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Delete usage log entries
@@ -178,6 +268,8 @@ class SecureUSBManager:
             conn.commit()
             conn.close()
             
+            self.invalidate_cache()
+            
             logger.info(f"Unregistered secure USB: {serial}")
             KioskLogger.audit("SECURE_USB_UNREGISTERED", serial=serial)
             
@@ -201,24 +293,15 @@ class SecureUSBManager:
             True if device is registered
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            device = self._devices().get(serial)
             
-            if vendor_id and product_id:
-                cursor.execute('''
-                    SELECT COUNT(*) FROM secure_usb_devices
-                    WHERE serial = ? AND vendor_id = ? AND product_id = ?
-                ''', (serial, vendor_id, product_id))
-            else:
-                cursor.execute('''
-                    SELECT COUNT(*) FROM secure_usb_devices
-                    WHERE serial = ?
-                ''', (serial,))
+            if device is None:
+                return False
             
-            count = cursor.fetchone()[0]
-            conn.close()
+            if vendor_id and product_id:
+                return device.vendor_id == vendor_id and device.product_id == product_id
             
-            return count > 0
+            return True
         
         except Exception as e:
             logger.error(f"Error checking USB registration: {e}", exc_info=True)
@@ -235,29 +318,7 @@ class SecureUSBManager:
             SecureUSBDevice or None
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT serial, vendor_id, product_id, label, notes, registered_date
-                FROM secure_usb_devices
-                WHERE serial = ?
-            ''', (serial,))
-            
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return SecureUSBDevice(
-                    serial=row[0],
-                    vendor_id=row[1],
-                    product_id=row[2],
-                    label=row[3],
-                    notes=row[4],
-                    registered_date=row[5]
-                )
-            
-            return None
+            return self._devices().get(serial)
         
         except Exception as e:
             logger.error(f"Error getting registered device: {e}", exc_info=True)
@@ -268,36 +329,14 @@ class SecureUSBManager:
         Get all registered USB devices
         
         Returns:
-            List of SecureUSBDevice objects
+            List of SecureUSBDevice objects, newest registration first
         """
-        devices = []
-        
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT serial, vendor_id, product_id, label, notes, registered_date
-                FROM secure_usb_devices
-                ORDER BY registered_date DESC
-            ''')
-            
-            for row in cursor.fetchall():
-                devices.append(SecureUSBDevice(
-                    serial=row[0],
-                    vendor_id=row[1],
-                    product_id=row[2],
-                    label=row[3],
-                    notes=row[4],
-                    registered_date=row[5]
-                ))
-            
-            conn.close()
+            return sorted(self._devices().values(), key=lambda d: d.registered_date or '', reverse=True)
         
         except Exception as e:
             logger.error(f"Error getting registered devices: {e}", exc_info=True)
-        
-        return devices
+            return []
     
     def log_usage(self, serial: str, session_id: str, file_count: int):
         """
@@ -309,7 +348,7 @@ class SecureUSBManager:
             file_count: Number of files transferred
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self._connect()
             cursor = conn.cursor()
             
             timestamp = datetime.now().isoformat()
@@ -335,13 +374,14 @@ class SecureUSBManager:
         except Exception as e:
             logger.error(f"Error logging USB usage: {e}", exc_info=True)
     
-    def get_usage_history(self, serial: str, limit: int = 50) -> List[Dict]:
+    def get_usage_history(self, serial: str, limit: int = 50, offset: int = 0) -> List[Dict]:
         """
-        Get usage history for a device
+        Get usage history for a device, newest first
         
         Args:
             serial: USB device serial number
             limit: Maximum number of entries to return
+            offset: Number of newest entries to skip (for paging)
             
         Returns:
             List of usage log entries
@@ -349,7 +389,7 @@ class SecureUSBManager:
         history = []
         
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -357,8 +397,8 @@ class SecureUSBManager:
                 FROM usage_log
                 WHERE serial = ?
                 ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (serial, limit))
+                LIMIT ? OFFSET ?
+            ''', (serial, limit, offset))
             
             for row in cursor.fetchall():
                 history.append({
@@ -374,6 +414,30 @@ class SecureUSBManager:
         
         return history
     
+    def get_usage_count(self, serial: str) -> int:
+        """
+        Get number of usage log entries for a device
+        
+        Args:
+            serial: USB device serial number
+            
+        Returns:
+            Number of usage log entries
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM usage_log WHERE serial = ?', (serial,))
+            count = cursor.fetchone()[0]
+            
+            conn.close()
+            return count
+        
+        except Exception as e:
+            logger.error(f"Error getting usage count: {e}", exc_info=True)
+            return 0
+    
     def export_registrations(self, export_path: Path) -> bool:
         """
         Export registered devices to JSON file
@@ -403,13 +467,15 @@ class SecureUSBManager:
             logger.error(f"Error exporting registrations: {e}", exc_info=True)
             return False
     
-    def import_registrations(self, import_path: Path, merge: bool = True) -> Tuple[int, int]:
+    def import_registrations(self, import_path: Path, merge: bool = True,
+                             progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, int]:
         """
         Import registered devices from JSON file
         
         Args:
             import_path: Path to import file
             merge: If True, merge with existing; if False, replace existing
+            progress_callback: Called with (processed, total) after each device
             
         Returns:
             Tuple of (successful_imports, failed_imports)
@@ -421,26 +487,51 @@ class SecureUSBManager:
             with open(import_path, 'r') as f:
                 import_data = json.load(f)
             
-            if not merge:
-                # Clear existing registrations
-                conn = sqlite3.connect(str(self.db_path))
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM usage_log')
-                cursor.execute('DELETE FROM secure_usb_devices')
-                conn.commit()
-                conn.close()
-                logger.info("Cleared existing registrations for import")
-            
-            for device_data in import_data.get('devices', []):
+            devices_data = import_data.get('devices', [])
+            devices = []
+            for device_data in devices_data:
                 try:
-                    device = SecureUSBDevice.from_dict(device_data)
-                    if self.register_usb(device):
-                        successful += 1
-                    else:
-                        failed += 1
+                    devices.append(SecureUSBDevice.from_dict(device_data))
                 except Exception as e:
                     logger.error(f"Error importing device: {e}")
                     failed += 1
+                
+                if progress_callback:
+                    progress_callback(len(devices) + failed, len(devices_data))
+            
+            # One transaction for the clear and all inserts: a single commit, and a
+            # failed replace leaves the existing registrations in place
+            conn = self._connect()
+            try:
+                with conn:
+                    if not merge:
+                        conn.execute('DELETE FROM usage_log')
+                        conn.execute('DELETE FROM secure_usb_devices')
+                    
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO secure_usb_devices
+                        (serial, vendor_id, product_id, label, notes, registered_date, last_used)
+                        VALUES (?, ?, ?, ?, ?, ?, NULL)
+                    ''', [
+                        (d.serial, d.vendor_id, d.product_id, d.label, d.notes, d.registered_date)
+                        for d in devices
+                    ])
+            except Exception as e:
+                logger.error(f"Error writing imported devices: {e}", exc_info=True)
+                return 0, failed + len(devices)
+            finally:
+                conn.close()
+            
+            if not merge:
+                logger.info("Cleared existing registrations for import")
+            
+            self.invalidate_cache()
+            
+            for device in devices:
+                KioskLogger.audit("SECURE_USB_REGISTERED",
+                                serial=device.serial,
+                                label=device.label)
+            successful = len(devices)
             
             logger.info(f"Imported registrations: {successful} successful, {failed} failed")
             return successful, failed
@@ -457,14 +548,7 @@ class SecureUSBManager:
             Number of registered devices
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT COUNT(*) FROM secure_usb_devices')
-            count = cursor.fetchone()[0]
-            
-            conn.close()
-            return count
+            return len(self._devices())
         
         except Exception as e:
             logger.error(f"Error getting device count: {e}", exc_info=True)
@@ -0,0 +1,164 @@
+"""
+USB Defender Kiosk - File Utilities
+Helpers for reading and copying files efficiently
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Union
+
+
+# Buffer for the userspace copy fallback; large writes amortize flash erase blocks
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def tail_lines(path: Union[str, Path], n: int, block: int = 8192) -> bytes:
+    """
+    Read the last lines of a file without reading the whole file
+    
+    Reads backwards from the end in blocks until enough lines are buffered,
+    so the cost depends on n rather than on the file size.
+    
+    Args:
+        path: File to read
+        n: Number of lines to return
+        block: Read block size in bytes
+        
+    Returns:
+        Last n lines as raw bytes, including line endings; callers decode once
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        
+        if size <= block:
+            f.seek(0)
+            data = f.read()
+        else:
+            data = b''
+            pos = size
+            # One extra newline guarantees the first kept line is complete
+            while pos > 0 and data.count(b'\n') <= n:
+                read_size = min(block, pos)
+                pos -= read_size
+                f.seek(pos)
+                data = f.read(read_size) + data
+    
+    # Walk back n newlines, ignoring the one terminating the last line
+    start = len(data) - 1 if data.endswith(b'\n') else len(data)
+    for _ in range(n):
+        start = data.rfind(b'\n', 0, start)
+        if start < 0:
+            break
+    
+    return data[start + 1:]
+
+
+def human_bytes(size_bytes: float) -> str:
+    """
+    Format a byte count in human-readable form
+    
+    Args:
+        size_bytes: Size in bytes
+        
+    Returns:
+        Formatted size string
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} TB"
+
+
+def copy_file(src: Union[str, Path], dst: Union[str, Path], fsync: bool = False):
+    """
+    Copy a file's data and metadata, like shutil.copy2, keeping data in the kernel
+    
+    Uses copy_file_range, which can clone extents on filesystems that support
+    it, then sendfile where that is unavailable (e.g. across filesystems on
+    older kernels), then a plain buffered copy.
+    
+    Args:
+        src: Source file
+        dst: Destination file path
+        fsync: Flush the copy to the device before returning, so it survives
+            the drive being pulled
+    """
+    try:
+        # O_NOATIME is only allowed on files we own
+        src_fd = os.open(src, os.O_RDONLY | getattr(os, 'O_NOATIME', 0))
+    except PermissionError:
+        src_fd = os.open(src, os.O_RDONLY)
+    
+    try:
+        size = os.fstat(src_fd).st_size
+        if hasattr(os, 'posix_fadvise'):
+            # Whole-file read: ask for aggressive readahead
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        
+        try:
+            copied = _copy_fd_range(src_fd, dst_fd, size)
+            
+            if copied < size:
+                os.lseek(dst_fd, copied, os.SEEK_SET)
+                try:
+                    while copied < size:
+                        sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                        if sent == 0:
+                            break
+                        copied += sent
+                except OSError:
+                    # No sendfile for this pair
+                    pass
+            
+            if copied < size:
+                # Finish with read/write from wherever the kernel copies stopped
+                os.lseek(src_fd, copied, os.SEEK_SET)
+                os.lseek(dst_fd, copied, os.SEEK_SET)
+                with os.fdopen(src_fd, 'rb', closefd=False) as fsrc, \
+                        os.fdopen(dst_fd, 'wb', closefd=False) as fdst:
+                    shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+                copied = os.lseek(dst_fd, 0, os.SEEK_CUR)
+                
+                if copied < size:
+                    raise OSError(f"Short copy of {src}: {copied} of {size} bytes")
+            
+            shutil.copystat(src, dst)
+            
+            if fsync:
+                os.fsync(dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _copy_fd_range(src_fd: int, dst_fd: int, size: int) -> int:
+    """
+    Copy with copy_file_range until done or unsupported
+    
+    Args:
+        src_fd: Source file descriptor
+        dst_fd: Destination file descriptor
+        size: Bytes to copy
+        
+    Returns:
+        Bytes copied; less than size if the caller must finish another way
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return 0
+    
+    copied = 0
+    try:
+        while copied < size:
+            n = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError:
+        # EXDEV, ENOSYS, EOPNOTSUPP, ...: fall back from where we got to
+        pass
+    
+    return copied
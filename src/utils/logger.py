@@ -8,7 +8,7 @@ import logging.handlers
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Union
 
 
 class KioskLogger:
@@ -116,6 +116,41 @@ class KioskLogger:
         logger.info(f"Log directory: {log_dir}")
         logger.info(f"Log level: {level_str}")
     
+    @classmethod
+    def configure_worker(cls, queue, level: int):
+        """
+        Configure logging in a worker process to forward records to the parent
+        
+        Used as a process pool initializer; the parent process writes the
+        records through its own handlers, so log files have a single writer.
+        
+        Args:
+            queue: multiprocessing queue read by start_listener in the parent
+            level: Root log level of the parent process
+        """
+        root_logger = logging.getLogger()
+        root_logger.handlers[:] = [logging.handlers.QueueHandler(queue)]
+        root_logger.setLevel(level)
+        cls._configured = True
+    
+    @classmethod
+    def start_listener(cls, queue) -> logging.handlers.QueueListener:
+        """
+        Start writing log records forwarded from worker processes
+        
+        Each record is handled by the parent's logger of the same name, so it
+        reaches the same files (e.g. conversion.log) as an in-process record.
+        
+        Args:
+            queue: multiprocessing queue passed to configure_worker
+            
+        Returns:
+            Running listener; call stop() once the workers are done
+        """
+        listener = logging.handlers.QueueListener(queue, _ForwardedRecordHandler())
+        listener.start()
+        return listener
+    
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
@@ -174,8 +209,11 @@ class KioskLogger:
         )
     
     @classmethod
-    def audit_file_conversion(cls, source: str, destination: str, status: str):
-        """Log file conversion"""
+    def audit_file_conversion(cls, source: str, destination: Union[str, List[str]], status: str):
+        """Log file conversion (one entry per source, even with many outputs)"""
+        if not isinstance(destination, str):
+            destination = ', '.join(destination)
+        
         cls.audit(
             "FILE_CONVERTED",
             source=source,
@@ -208,3 +246,9 @@ class KioskLogger:
             status=status
         )
 
+
+class _ForwardedRecordHandler(logging.Handler):
+    """Hands records from worker processes to the local logger of the same name"""
+    
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)